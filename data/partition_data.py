@@ -0,0 +1,143 @@
+"""
+Rewrite the large StatsBomb tables into sorted, hive-partitioned parquet.
+
+events, three_sixty and lineups are split by competition and season
+(looked up from matches.parquet), sorted by match_id, period, index_num and
+written with zstd and row groups sized so that a single match spans only a
+few of them::
+
+    data/Statsbomb/partitioned/events/competition=la_liga/season=2015_2016/00000000.parquet
+
+Rows whose match_id is missing from matches.parquet are kept under
+``competition=unknown/season=unknown``.
+
+Season and competition filters prune whole directories, and the per-row-group
+match_id statistics let a single-match read skip every other row group:
+
+    pl.scan_parquet("data/Statsbomb/partitioned/events", hive_partitioning=True)
+        .filter(pl.col("match_id") == 15973)
+
+    SELECT * FROM read_parquet('data/Statsbomb/partitioned/events/**/*.parquet',
+                               hive_partitioning = true)
+    WHERE season = '2015_2016' AND match_id = 15973
+
+Usage:
+    python data/partition_data.py                  # all tables
+    python data/partition_data.py --tables events  # just events
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import shutil
+import tempfile
+from pathlib import Path
+
+import polars as pl
+
+STATSBOMB_DIR = Path(__file__).parent / "Statsbomb"
+PARTITIONED_DIR = STATSBOMB_DIR / "partitioned"
+TABLES = ("events", "three_sixty", "lineups")
+PARTITION_COLUMNS = ("competition", "season")
+
+# Sort keys in priority order; columns a table does not have are skipped
+SORT_COLUMNS = ("match_id", "period", "index_num", "event_uuid", "team_name")
+
+# ~64k rows is a few (real) matches of events per row group: small enough for
+# match_id statistics to prune well, large enough to keep zstd effective
+ROW_GROUP_ROWS = {"events": 65_536, "three_sixty": 131_072, "lineups": 65_536}
+COMPRESSION_LEVEL = 6
+
+
+def slug(value: str | None) -> str:
+    """Filesystem-safe partition value, e.g. '2015/2016' -> '2015_2016'."""
+    if value is None:
+        return "unknown"
+    return re.sub(r"[^0-9a-z]+", "_", value.lower()).strip("_") or "unknown"
+
+
+def match_partitions() -> pl.DataFrame:
+    """match_id -> (competition, season) slugs from matches.parquet."""
+    matches = pl.read_parquet(
+        STATSBOMB_DIR / "matches.parquet",
+        columns=["match_id", "competition_name", "season_name"],
+    )
+    return matches.select(
+        "match_id",
+        pl.col("competition_name")
+        .map_elements(slug, return_dtype=pl.String)
+        .alias("competition"),
+        pl.col("season_name").map_elements(slug, return_dtype=pl.String).alias("season"),
+    )
+
+
+def partition_table(name: str, partitions: pl.DataFrame, out_dir: Path) -> int:
+    """Write one table's partitions under ``out_dir / name``; returns file count.
+
+    The table is read once: rows are joined to their competition/season,
+    sorted and streamed into one file per partition. Rows of matches missing
+    from matches.parquet go to the ``unknown`` partition instead of being
+    dropped.
+    """
+    source = pl.scan_parquet(STATSBOMB_DIR / f"{name}.parquet")
+    schema = source.collect_schema()
+    sort_by = [c for c in SORT_COLUMNS if c in schema]
+    dest = out_dir / name
+    (
+        source.join(partitions.lazy(), on="match_id", how="left")
+        .with_columns(pl.col(PARTITION_COLUMNS).fill_null("unknown"))
+        .sort(sort_by)
+        .sink_parquet(
+            pl.PartitionBy(
+                dest,
+                key=list(PARTITION_COLUMNS),
+                include_key=False,
+                approximate_bytes_per_file=None,
+            ),
+            compression="zstd",
+            compression_level=COMPRESSION_LEVEL,
+            row_group_size=ROW_GROUP_ROWS.get(name, 65_536),
+            statistics=True,
+            mkdir=True,
+        )
+    )
+    unknown = dest / "competition=unknown"
+    if unknown.exists():
+        rows = pl.scan_parquet(unknown / "**/*.parquet").select(pl.len()).collect()
+        print(f"  {name}: {rows.item():,} rows with a match_id not in matches.parquet")
+    return len(list(dest.rglob("*.parquet")))
+
+
+def partition_data(tables: tuple[str, ...] = TABLES) -> None:
+    """Re-layout the given tables, replacing any previous partitioned copy."""
+    partitions = match_partitions()
+    PARTITIONED_DIR.mkdir(parents=True, exist_ok=True)
+    for name in tables:
+        # Build next to the destination, then swap it in
+        tmp_dir = Path(tempfile.mkdtemp(prefix=f".{name}-", dir=PARTITIONED_DIR))
+        try:
+            files = partition_table(name, partitions, tmp_dir)
+            dest = PARTITIONED_DIR / name
+            if dest.exists():
+                shutil.rmtree(dest)
+            os.replace(tmp_dir / name, dest)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        print(f"  {name}: {files} partitions -> {dest}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Partition the StatsBomb tables.")
+    parser.add_argument("--tables", nargs="+", choices=TABLES, default=list(TABLES))
+    args = parser.parse_args()
+
+    print(f"Partitioning {', '.join(args.tables)} by competition/season...")
+    partition_data(tuple(args.tables))
+    print("Partitioning complete.")
+
+
+if __name__ == "__main__":
+    main()
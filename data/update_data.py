@@ -0,0 +1,473 @@
+"""
+Incremental, manifest-driven data updater.
+
+Keeps ``data/manifest.json`` with the size, SHA-256 and source version of
+every downloaded file and only fetches files whose remote copy differs.
+Folders are listed and files downloaded concurrently. Each file is written
+to a ``.<name>.download`` file next to its destination; an interrupted
+download of the same remote version resumes from the bytes already there
+(retrying a flaky link several times within one run). The finished file
+must pass a size check, a parquet structure check and a checksum before it
+is swapped in with
+``os.replace``, so readers never see a half-written parquet. A nightly
+refresh therefore costs only the changed bytes.
+
+Sources are pluggable: ``GDriveSource`` reads the shared Google Drive
+folders (via gdown), ``LocalDirSource`` mirrors a local directory with the
+same ``<folder>/<file>`` layout and stands in for the remote in tests.
+
+Usage:
+    python data/update_data.py                      # from Google Drive
+    python data/update_data.py --source-dir /mnt/x  # from a local mirror
+    python data/update_data.py --dry-run            # only list what would change
+    python data/update_data.py --jobs 8             # concurrent downloads
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+DATA_DIR = Path(__file__).parent
+MANIFEST_PATH = DATA_DIR / "manifest.json"
+FOLDERS = {
+    "Polymarket": "1k04QXUITT8H2XgRNNBjzK0kO7plXNL5E",
+    "Statsbomb": "1QpFf8qASVVtKz1B93mEx34phL1vtGcO6",
+}
+ALLOWED_EXTENSIONS = {".parquet", ".md"}
+CHUNK_SIZE = 1 << 20
+RETRIES = 5
+RETRY_DELAY = 2.0
+PARQUET_MAGIC = b"PAR1"
+
+# Serializes progress output and manifest writes across download threads
+_lock = threading.Lock()
+
+
+@dataclass
+class RemoteFile:
+    """One file as listed by a source."""
+
+    folder: str
+    name: str
+    size: int | None
+    sha256: str | None
+    version: str
+    handle: Any = None
+    md5: str | None = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.folder}/{self.name}"
+
+
+class Source:
+    """Where data files come from; subclasses list and fetch them."""
+
+    folders: tuple[str, ...] = tuple(FOLDERS)
+
+    def list_files(self, folder: str) -> list[RemoteFile]:
+        raise NotImplementedError
+
+    def fetch(self, remote: RemoteFile, dest: Path) -> None:
+        """Write ``remote`` to ``dest``, resuming after the bytes already there.
+
+        May stop early or raise ``OSError``; the caller retries and resumes.
+        """
+        raise NotImplementedError
+
+
+class LocalDirSource(Source):
+    """A local directory laid out as ``<root>/<folder>/<file>``.
+
+    ``interrupt_after`` simulates a dropped connection: each fetch raises
+    after copying that many bytes, which exercises resume in tests.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        folders: tuple[str, ...] | None = None,
+        interrupt_after: int | None = None,
+    ) -> None:
+        self.root = Path(root)
+        if folders is None:
+            folders = tuple(sorted(p.name for p in self.root.iterdir() if p.is_dir()))
+        self.folders = folders
+        self.interrupt_after = interrupt_after
+
+    def list_files(self, folder: str) -> list[RemoteFile]:
+        files = []
+        for path in sorted((self.root / folder).iterdir()):
+            if path.is_file():
+                stat = path.stat()
+                files.append(
+                    RemoteFile(
+                        folder=folder,
+                        name=path.name,
+                        size=stat.st_size,
+                        sha256=sha256_file(path),
+                        version=str(stat.st_mtime_ns),
+                        handle=path,
+                    )
+                )
+        return files
+
+    def fetch(self, remote: RemoteFile, dest: Path) -> None:
+        offset = dest.stat().st_size if dest.exists() else 0
+        copied = 0
+        with open(remote.handle, "rb") as src, open(dest, "ab") as out:
+            src.seek(offset)
+            while chunk := src.read(CHUNK_SIZE):
+                if self.interrupt_after is not None:
+                    chunk = chunk[: self.interrupt_after - copied]
+                out.write(chunk)
+                copied += len(chunk)
+                if self.interrupt_after is not None and copied >= self.interrupt_after:
+                    raise OSError(f"connection dropped after {copied:,} bytes")
+
+
+class GDriveSource(Source):
+    """The shared Google Drive folders, listed and downloaded with gdown.
+
+    gdown listings carry no checksum. With a Drive API key (``api_key`` or
+    ``GDRIVE_API_KEY``) each file's size, ``md5Checksum`` and modified time
+    come from the Drive API and the MD5 is verified after download. Without
+    one, a file counts as changed when its Drive file id or its size (read
+    from a one-byte ranged request) differs from the manifest, and parquet
+    downloads are verified by reading every row group instead.
+    """
+
+    DOWNLOAD_URL = (
+        "https://drive.usercontent.google.com/download"
+        "?id={id}&export=download&confirm=t"
+    )
+    METADATA_URL = (
+        "https://www.googleapis.com/drive/v3/files/{id}"
+        "?fields=size,md5Checksum,modifiedTime&key={key}"
+    )
+
+    def __init__(
+        self, folders: dict[str, str] = FOLDERS, api_key: str | None = None
+    ) -> None:
+        self.folder_ids = folders
+        self.folders = tuple(folders)
+        self.api_key = api_key or os.environ.get("GDRIVE_API_KEY")
+
+    def list_files(self, folder: str) -> list[RemoteFile]:
+        import gdown
+
+        listed = gdown.download_folder(
+            id=self.folder_ids[folder],
+            skip_download=True,
+            quiet=True,
+            remaining_ok=True,
+        )
+        return [
+            self.remote_file(folder, Path(item.path).name, item.id) for item in listed
+        ]
+
+    def remote_file(self, folder: str, name: str, file_id: str) -> RemoteFile:
+        metadata = self.metadata(file_id)
+        if metadata is None:
+            size, md5, version = self.remote_size(file_id), None, file_id
+        else:
+            size = int(metadata["size"]) if "size" in metadata else None
+            md5 = metadata.get("md5Checksum")
+            version = f"{file_id}@{metadata.get('modifiedTime', '')}"
+        return RemoteFile(
+            folder=folder,
+            name=name,
+            size=size,
+            sha256=None,
+            version=version,
+            handle=file_id,
+            md5=md5,
+        )
+
+    def metadata(self, file_id: str) -> dict[str, Any] | None:
+        """Drive API metadata, or None without an API key or on error."""
+        if not self.api_key:
+            return None
+        url = self.METADATA_URL.format(id=file_id, key=self.api_key)
+        try:
+            with urllib.request.urlopen(url, timeout=30) as response:
+                return json.loads(response.read())
+        except (OSError, ValueError):
+            return None
+
+    def remote_size(self, file_id: str) -> int | None:
+        request = urllib.request.Request(
+            self.DOWNLOAD_URL.format(id=file_id), headers={"Range": "bytes=0-0"}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                content_range = response.headers.get("Content-Range", "")
+        except OSError:
+            return None
+        total = content_range.rpartition("/")[2]
+        return int(total) if total.isdigit() else None
+
+    def fetch(self, remote: RemoteFile, dest: Path) -> None:
+        offset = dest.stat().st_size if dest.exists() else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        request = urllib.request.Request(
+            self.DOWNLOAD_URL.format(id=remote.handle), headers=headers
+        )
+        try:
+            response = urllib.request.urlopen(request, timeout=60)
+        except urllib.error.HTTPError as e:
+            if e.code == 416 and offset:
+                # Nothing past ``offset``: the partial is already complete
+                # (with an unknown size this is the only way to tell);
+                # validate() decides whether it is intact
+                return
+            raise
+        with response:
+            if response.headers.get_content_type() == "text/html":
+                # Drive answered with a confirmation page; let gdown handle it
+                return self._fetch_with_gdown(remote, dest)
+            # 200 instead of 206 means the server ignored the range
+            mode = "ab" if offset and response.status == 206 else "wb"
+            with open(dest, mode) as out:
+                while chunk := response.read(CHUNK_SIZE):
+                    out.write(chunk)
+
+    def _fetch_with_gdown(self, remote: RemoteFile, dest: Path) -> None:
+        import gdown
+
+        dest.unlink(missing_ok=True)
+        if gdown.download(id=remote.handle, output=str(dest), quiet=True) is None:
+            raise OSError(f"gdown could not download {remote.key}")
+
+
+def _file_digest(path: Path, algorithm: str) -> str:
+    digest = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def sha256_file(path: Path) -> str:
+    return _file_digest(path, "sha256")
+
+
+def md5_file(path: Path) -> str:
+    return _file_digest(path, "md5")
+
+
+def load_manifest(path: Path = MANIFEST_PATH) -> dict[str, Any]:
+    if not path.exists():
+        return {"version": 1, "files": {}}
+    return json.loads(path.read_text())
+
+
+def save_manifest(manifest: dict[str, Any], path: Path = MANIFEST_PATH) -> None:
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    os.replace(tmp, path)
+
+
+def is_current(remote: RemoteFile, entry: dict[str, Any] | None, local: Path) -> bool:
+    """True if the local copy recorded in ``entry`` matches ``remote``."""
+    if entry is None or not local.exists() or local.stat().st_size != entry["size"]:
+        return False
+    if remote.size is not None and remote.size != entry["size"]:
+        return False
+    if remote.sha256 is not None:
+        return remote.sha256 == entry["sha256"]
+    return remote.version == entry["source_version"]
+
+
+def _partial_info(remote: RemoteFile) -> dict[str, Any]:
+    """What a partial download was started from; resumed only if it matches."""
+    return {
+        "version": remote.version,
+        "size": remote.size,
+        "sha256": remote.sha256,
+        "md5": remote.md5,
+    }
+
+
+def discard_partial(tmp: Path) -> None:
+    tmp.unlink(missing_ok=True)
+    tmp.with_name(f"{tmp.name}.json").unlink(missing_ok=True)
+
+
+def download(source: Source, remote: RemoteFile, tmp: Path) -> None:
+    """Fetch ``remote`` into ``tmp``, resuming and retrying on a flaky link.
+
+    ``tmp.json`` records the remote version and size the partial belongs to;
+    a partial of any other version is discarded rather than resumed, so bytes
+    of two versions are never spliced together.
+    """
+    info_path = tmp.with_name(f"{tmp.name}.json")
+    try:
+        started_from = json.loads(info_path.read_text())
+    except (OSError, ValueError):
+        started_from = None
+    if started_from != _partial_info(remote):
+        discard_partial(tmp)
+        info_path.write_text(json.dumps(_partial_info(remote)))
+    for attempt in range(1, RETRIES + 1):
+        have = tmp.stat().st_size if tmp.exists() else 0
+        if remote.size is not None and have > remote.size:
+            tmp.unlink()
+            have = 0
+        if remote.size is not None and have == remote.size:
+            return
+        try:
+            source.fetch(remote, tmp)
+            if remote.size is None or tmp.stat().st_size >= remote.size:
+                return
+            error = "connection closed early"
+        except OSError as e:
+            error = str(e)
+        have = tmp.stat().st_size if tmp.exists() else 0
+        if attempt < RETRIES:
+            with _lock:
+                print(f"  Retrying {remote.key} from byte {have:,}: {error}")
+            time.sleep(RETRY_DELAY * attempt)
+    raise OSError(f"{remote.key}: gave up after {RETRIES} attempts ({error})")
+
+
+def validate(remote: RemoteFile, path: Path) -> str:
+    """Check size, parquet structure and checksum of a download; return its SHA-256.
+
+    When the source supplies neither a SHA-256 nor an MD5, a parquet file is
+    read in full (one row group at a time) as the integrity check.
+    """
+    size = path.stat().st_size
+    if remote.size is not None and size != remote.size:
+        raise OSError(f"{remote.key}: got {size:,} bytes, expected {remote.size:,}")
+    if Path(remote.name).suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        with open(path, "rb") as f:
+            head = f.read(4)
+            f.seek(max(size - 4, 0))
+            tail = f.read(4)
+        if head != PARQUET_MAGIC or tail != PARQUET_MAGIC:
+            raise OSError(f"{remote.key}: truncated or not a parquet file")
+        try:
+            parquet = pq.ParquetFile(path)
+            if remote.sha256 is None and remote.md5 is None:
+                for i in range(parquet.num_row_groups):
+                    parquet.read_row_group(i)
+        except Exception as e:
+            raise OSError(f"{remote.key}: corrupt parquet file ({e})") from e
+    digest = sha256_file(path)
+    if remote.sha256 is not None and digest != remote.sha256:
+        raise OSError(f"{remote.key}: checksum mismatch")
+    if remote.md5 is not None and md5_file(path) != remote.md5:
+        raise OSError(f"{remote.key}: MD5 mismatch")
+    return digest
+
+
+def install(source: Source, remote: RemoteFile, dest: Path) -> dict[str, Any]:
+    """Fetch ``remote`` beside ``dest``, verify it and atomically swap it in.
+
+    A partial download is kept for the next attempt; one that fails
+    validation is discarded so the next run starts it afresh.
+    """
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(f".{dest.name}.download")
+    download(source, remote, tmp)
+    try:
+        digest = validate(remote, tmp)
+    except OSError:
+        discard_partial(tmp)
+        raise
+    size = tmp.stat().st_size
+    os.replace(tmp, dest)
+    discard_partial(tmp)
+    return {
+        "size": size,
+        "sha256": digest,
+        "source_version": remote.version,
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def update(
+    source: Source,
+    data_dir: Path = DATA_DIR,
+    manifest_path: Path | None = None,
+    dry_run: bool = False,
+    jobs: int = 4,
+) -> dict[str, list[str]]:
+    """Bring ``data_dir`` up to date with ``source``; returns changed/skipped keys.
+
+    Folders are listed, and changed files downloaded, on ``jobs`` threads.
+    """
+    manifest_path = manifest_path or data_dir / "manifest.json"
+    manifest = load_manifest(manifest_path)
+    result: dict[str, list[str]] = {"updated": [], "unchanged": [], "failed": []}
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        listings = pool.map(source.list_files, source.folders)
+        pending = []
+        for remote in (remote for listing in listings for remote in listing):
+            if Path(remote.name).suffix.lower() not in ALLOWED_EXTENSIONS:
+                continue
+            dest = data_dir / remote.folder / remote.name
+            if is_current(remote, manifest["files"].get(remote.key), dest):
+                result["unchanged"].append(remote.key)
+            elif dry_run:
+                print(f"  Would update: {remote.key}")
+                result["updated"].append(remote.key)
+            else:
+                pending.append((remote, dest))
+
+        def one(remote: RemoteFile, dest: Path) -> None:
+            try:
+                entry = install(source, remote, dest)
+            except OSError as e:
+                with _lock:
+                    print(f"  FAILED: {e}")
+                    result["failed"].append(remote.key)
+                return
+            with _lock:
+                manifest["files"][remote.key] = entry
+                print(f"  Updated: {remote.key} ({entry['size']:,} bytes)")
+                result["updated"].append(remote.key)
+                # Persist after every file so an interrupted run keeps its progress
+                save_manifest(manifest, manifest_path)
+
+        list(pool.map(lambda job: one(*job), pending))
+
+    print(
+        f"\n{len(result['updated'])} updated, {len(result['unchanged'])} unchanged, "
+        f"{len(result['failed'])} failed."
+    )
+    return result
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Incrementally update data/.")
+    parser.add_argument("--source-dir", type=Path, help="Use a local mirror as source")
+    parser.add_argument("--dry-run", action="store_true", help="Only report changes")
+    parser.add_argument("--jobs", type=int, default=4, help="Concurrent downloads")
+    args = parser.parse_args()
+
+    source = LocalDirSource(args.source_dir) if args.source_dir else GDriveSource()
+    result = update(source, dry_run=args.dry_run, jobs=args.jobs)
+    if result["failed"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,19 @@
 import duckdb
-import math
+from pathlib import Path
 
-#IF NOT INSTALLED THEN INSTALL spatial
+from pitch_geometry import register
 
-project_location = 'C://Users/Tyler/Documents/GitHub/soccer-analytics-capstone-template/data'
+# pitch_distance() and friends are plain SQL macros, no spatial extension needed
+register()
 
-possession_tl = duckdb.sql(f"""
-                           LOAD spatial;
+project_location = (Path(__file__).parent.parent / 'data').as_posix()
+
+
+# Reference query for a single match (match_id=None: all matches);
+# possession_features.py computes the same table in one Polars pass.
+def possession_timeline(match_id=15973, location=project_location):
+    match_filter = '' if match_id is None else f'match_id = {match_id} AND'
+    return duckdb.sql(f"""
 
                            with match_events as (
                                 SELECT id, index_num, period, minute, second, timestamp, duration, location_x, location_y, possession, possession_team_id, type, 
@@ -37,8 +44,8 @@ possession_tl = duckdb.sql(f"""
 
 
 
-                                FROM read_parquet('{project_location}/Statsbomb/events.parquet') 
-                                WHERE match_id = 15973 AND type NOT IN ('Starting XI','Half Start', 'Half End','Ball Receipt*', 'Ball Recovery')
+                                FROM read_parquet('{location}/Statsbomb/events.parquet') 
+                                WHERE {match_filter} type NOT IN ('Starting XI','Half Start', 'Half End','Ball Receipt*', 'Ball Recovery')
                                 AND possession_team_id = team_id
                                 AND location_x IS NOT NULL
                                 AND location_y IS NOT NULL
@@ -48,7 +55,7 @@ possession_tl = duckdb.sql(f"""
                                 FROM match_events
                                 ),
                                 calc_event_dist as (
-                                SELECT get_next.*, ST_Distance(ST_Point(location_x, location_y), ST_Point(next_location_x, next_location_y)) euclidean_distance
+                                SELECT get_next.*, pitch_distance(location_x, location_y, next_location_x, next_location_y) euclidean_distance
                                 FROM get_next
                                 ),
                                 possession_metrics as (
@@ -108,8 +115,11 @@ possession_tl = duckdb.sql(f"""
                                     pass_distance, pass_attempts, high_passes, ground_passes, low_passes, drop_kick_passes, head_passes, keeper_arm_passes, left_foot_passes, right_foot_passes, other_passes,
                                     inswinging_passes, straight_passes, through_ball_passes, 
 
-                                ST_Distance(ST_Point(poss_start_x, poss_start_y), ST_Point(poss_end_x, poss_end_y)) relative_distance
+                                pitch_distance(poss_start_x, poss_start_y, poss_end_x, poss_end_y) relative_distance
                                 FROM start_stop_coordinates 
-                                ORDER BY possession
+                                ORDER BY start_stop_coordinates.match_id, possession
                                 """)
-print(possession_tl)
+
+
+if __name__ == "__main__":
+    print(possession_timeline())
@@ -0,0 +1,279 @@
+"""
+Persistent DuckDB catalog of the StatsBomb and Polymarket parquet files.
+
+``build()`` loads every parquet file once into typed, sorted DuckDB tables in
+``data/derived/soccer.duckdb``, adds views for the common joins and ART
+indexes on the join/filter keys. Analyses then query the database through
+``connect()`` instead of re-decoding parquet from a hardcoded path:
+
+    from duckdb_catalog import connect
+
+    con = connect()
+    con.sql("SELECT type, COUNT(*) FROM events WHERE match_id = 15973 GROUP BY type")
+
+Tables: matches, events, lineups, three_sixty, reference, markets, tokens,
+trades, odds_history, event_stats, summary (Polymarket ones only if present).
+Views: events_with_matches (events + match context), trades_enriched
+(trades + token outcome + market). The pitch_geometry macros
+(pitch_distance, angle_to_goal, pitch_zone, ...) are stored in the database.
+
+Usage:
+    python eda/duckdb_catalog.py            # build if any source changed
+    python eda/duckdb_catalog.py --force    # always rebuild
+    python eda/duckdb_catalog.py --info     # row counts and build time
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+import duckdb
+from pitch_geometry import register
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+STATSBOMB_DIR = DATA_DIR / "Statsbomb"
+POLYMARKET_DIR = DATA_DIR / "Polymarket"
+DB_PATH = DATA_DIR / "derived" / "soccer.duckdb"
+
+# Table name -> source parquet file
+SOURCES = {
+    "matches": STATSBOMB_DIR / "matches.parquet",
+    "events": STATSBOMB_DIR / "events.parquet",
+    "lineups": STATSBOMB_DIR / "lineups.parquet",
+    "three_sixty": STATSBOMB_DIR / "three_sixty.parquet",
+    "reference": STATSBOMB_DIR / "reference.parquet",
+    "markets": POLYMARKET_DIR / "soccer_markets.parquet",
+    "tokens": POLYMARKET_DIR / "soccer_tokens.parquet",
+    "trades": POLYMARKET_DIR / "soccer_trades.parquet",
+    "odds_history": POLYMARKET_DIR / "soccer_odds_history.parquet",
+    "event_stats": POLYMARKET_DIR / "soccer_event_stats.parquet",
+    "summary": POLYMARKET_DIR / "soccer_summary.parquet",
+}
+
+# Some exports store epoch milliseconds in microsecond TIMESTAMP columns;
+# values that are too small to be microseconds are scaled up
+_MS_TIMESTAMP = (
+    "CASE WHEN epoch_us({col}) < 100000000000000 "
+    "THEN make_timestamp(epoch_us({col}) * 1000) ELSE {col} END"
+)
+
+# Narrower / corrected types per table; columns a file does not have are skipped
+COLUMN_TYPES = {
+    "matches": {
+        "match_id": "INTEGER",
+        "match_date": "DATE",
+        "home_score": "SMALLINT",
+        "away_score": "SMALLINT",
+    },
+    "events": {
+        "match_id": "INTEGER",
+        "index_num": "INTEGER",
+        "period": "TINYINT",
+        "minute": "SMALLINT",
+        "second": "TINYINT",
+        "possession": "SMALLINT",
+        "team_id": "INTEGER",
+        "player_id": "INTEGER",
+        "position_id": "SMALLINT",
+        "possession_team_id": "INTEGER",
+    },
+    "lineups": {"match_id": "INTEGER", "jersey_number": "SMALLINT"},
+    "three_sixty": {"match_id": "INTEGER"},
+    "trades": {"timestamp": _MS_TIMESTAMP},
+    "odds_history": {"timestamp": _MS_TIMESTAMP},
+}
+
+# Physical sort order on load, so DuckDB's zonemaps prune by these keys
+SORT_KEYS = {
+    "matches": ["match_id"],
+    "events": ["match_id", "period", "index_num"],
+    "lineups": ["match_id"],
+    "three_sixty": ["match_id"],
+    "trades": ["market_id", "timestamp"],
+    "odds_history": ["market_id", "token_id", "timestamp"],
+}
+
+INDEXES = {
+    "matches": ["match_id"],
+    "events": ["match_id"],
+    "lineups": ["match_id"],
+    "three_sixty": ["match_id"],
+    "markets": ["market_id"],
+    "tokens": ["token_id", "market_id"],
+    "trades": ["market_id", "token_id"],
+    "odds_history": ["market_id", "token_id"],
+    "summary": ["market_id"],
+}
+
+VIEWS = {
+    "events_with_matches": (
+        ("events", "matches"),
+        """
+        SELECT e.*, m.competition_name, m.season_name, m.match_date,
+               m.home_team, m.away_team
+        FROM events e JOIN matches m USING (match_id)
+        """,
+    ),
+    "trades_enriched": (
+        ("trades", "tokens", "markets"),
+        """
+        SELECT t.*, k.outcome, m.question, m.slug, m.event_slug, m.category
+        FROM trades t
+        JOIN tokens k ON t.token_id = k.token_id
+        JOIN markets m ON t.market_id = m.market_id
+        """,
+    ),
+}
+
+_pool: dict[Path, duckdb.DuckDBPyConnection] = {}
+_pool_lock = threading.RLock()
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def source_fingerprint() -> dict[str, list[int]]:
+    """(size, mtime_ns) of every source file that exists."""
+    return {
+        name: [path.stat().st_size, path.stat().st_mtime_ns]
+        for name, path in SOURCES.items()
+        if path.exists()
+    }
+
+
+def _load_table(con: duckdb.DuckDBPyConnection, name: str, path: Path) -> None:
+    source = f"read_parquet('{path.as_posix()}')"
+    described = con.execute(f"DESCRIBE SELECT * FROM {source}").fetchall()
+    columns = [row[0] for row in described]
+    replace = []
+    for col, sql_type in COLUMN_TYPES.get(name, {}).items():
+        if col not in columns:
+            continue
+        expr = (
+            sql_type.format(col=_quote(col))
+            if "{col}" in sql_type
+            else f"CAST({_quote(col)} AS {sql_type})"
+        )
+        replace.append(f"{expr} AS {_quote(col)}")
+    select = "*" + (f" REPLACE ({', '.join(replace)})" if replace else "")
+    order = [_quote(c) for c in SORT_KEYS.get(name, []) if c in columns]
+    order_by = f" ORDER BY {', '.join(order)}" if order else ""
+    con.execute(f"CREATE TABLE {name} AS SELECT {select} FROM {source}{order_by}")
+    for col in INDEXES.get(name, []):
+        if col in columns:
+            con.execute(f"CREATE INDEX {name}_{col}_idx ON {name} ({_quote(col)})")
+
+
+def build(db_path: Path = DB_PATH) -> Path:
+    """Build the catalog into a temp file and atomically replace ``db_path``."""
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = db_path.with_name(f".{db_path.name}.{os.getpid()}.tmp")
+    tmp_path.unlink(missing_ok=True)
+    fingerprint = source_fingerprint()
+    con = duckdb.connect(str(tmp_path))
+    try:
+        for name in fingerprint:
+            _load_table(con, name, SOURCES[name])
+        # Persist the pitch-geometry macros so every catalog connection has them
+        register(con, temporary=False)
+        for view, (needs, sql) in VIEWS.items():
+            if all(table in fingerprint for table in needs):
+                con.execute(f"CREATE VIEW {view} AS {sql}")
+        con.execute(
+            "CREATE TABLE _catalog (source VARCHAR, size BIGINT, mtime_ns BIGINT, "
+            "built_at TIMESTAMP)"
+        )
+        built_at = datetime.now(timezone.utc).replace(tzinfo=None)
+        con.executemany(
+            "INSERT INTO _catalog VALUES (?, ?, ?, ?)",
+            [[name, *stat, built_at] for name, stat in fingerprint.items()],
+        )
+        con.execute("CHECKPOINT")
+    finally:
+        con.close()
+    # Drop pooled connections to the old file before swapping it out
+    close(db_path)
+    os.replace(tmp_path, db_path)
+    return db_path
+
+
+def is_stale(db_path: Path = DB_PATH) -> bool:
+    """True if the catalog is missing or was built from different source files."""
+    if not db_path.exists():
+        return True
+    try:
+        con = duckdb.connect(str(db_path), read_only=True)
+    except duckdb.Error:
+        return True
+    try:
+        rows = con.execute("SELECT source, size, mtime_ns FROM _catalog").fetchall()
+    except duckdb.Error:
+        return True
+    finally:
+        con.close()
+    return {name: [size, mtime] for name, size, mtime in rows} != source_fingerprint()
+
+
+def connect(
+    db_path: Path = DB_PATH, build_if_stale: bool = True
+) -> duckdb.DuckDBPyConnection:
+    """Return a cursor on a shared read-only connection to the catalog.
+
+    The underlying database is opened once per process; each call returns a
+    cheap cursor, so threads can each hold their own.
+    """
+    db_path = Path(db_path)
+    with _pool_lock:
+        con = _pool.get(db_path)
+        if con is None:
+            if build_if_stale and is_stale(db_path):
+                build(db_path)
+            con = duckdb.connect(str(db_path), read_only=True)
+            _pool[db_path] = con
+        return con.cursor()
+
+
+def close(db_path: Path = DB_PATH) -> None:
+    """Close the pooled connection to ``db_path`` (if open)."""
+    with _pool_lock:
+        con = _pool.pop(Path(db_path), None)
+    if con is not None:
+        con.close()
+
+
+def info(db_path: Path = DB_PATH) -> None:
+    con = connect(db_path, build_if_stale=False)
+    built_at = con.execute("SELECT max(built_at) FROM _catalog").fetchone()[0]
+    print(f"{db_path} (built {built_at:%Y-%m-%d %H:%M:%S} UTC)")
+    for (table,) in con.execute(
+        "SELECT table_name FROM duckdb_tables() WHERE NOT starts_with(table_name, '_') "
+        "ORDER BY table_name"
+    ).fetchall():
+        rows = con.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        print(f"  {table}: {rows:,} rows")
+    views = con.execute(
+        "SELECT view_name FROM duckdb_views() WHERE NOT internal ORDER BY view_name"
+    ).fetchall()
+    print(f"  views: {', '.join(v for (v,) in views)}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the DuckDB catalog.")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if fresh")
+    parser.add_argument("--info", action="store_true", help="Show tables and exit")
+    parser.add_argument("--db", type=Path, default=DB_PATH)
+    args = parser.parse_args()
+
+    if args.info:
+        info(args.db)
+    elif args.force or is_stale(args.db):
+        print(f"Building {build(args.db)}")
+        info(args.db)
+    else:
+        print(f"Catalog is up to date: {args.db}")
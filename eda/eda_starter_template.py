@@ -6,13 +6,27 @@ Uses Polars LazyFrames for memory-efficient processing.
 
 from __future__ import annotations
 
+import contextlib
+import hashlib
+import inspect
+import io
+import multiprocessing
+import os
+import pickle
+import re
+import sys
+import time
 import warnings
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
 import polars as pl
 import psutil
 
+from memory_sampler import MemorySampler
+
 warnings.filterwarnings("ignore")
 
 # Constants
@@ -22,9 +36,28 @@ DATA_DIR = Path(__file__).parent.parent / "data"
 POLYMARKET_DIR = DATA_DIR / "Polymarket"
 STATSBOMB_DIR = DATA_DIR / "Statsbomb"
 
+# Batch mode: all queries of an analyzer share one scan and run as a single
+# pl.collect_all plan (set to False with --sequential)
+BATCH = True
+# Streaming mode: run queries on Polars' streaming engine (implied by
+# --max-memory, which also caps each analyzer's RSS at MAX_MEMORY bytes)
+STREAMING = False
+MAX_MEMORY: int | None = None
+# Approximate mode: describe and distinct counts on the largest files come from
+# mergeable sketches built one row group at a time (see sketches.py)
+APPROX = False
+
+# Result cache: each analyzer's output and result, keyed by code + input files
+CACHE_DIR = DATA_DIR / "derived" / "eda_cache"
+# Local modules whose code can change what the analyzers print or return
+CACHE_HELPER_MODULES = ("sketches.py", "parquet_inventory.py")
+USE_CACHE = True
+
 # Memory tracking
 _process = psutil.Process()
 _peak_memory_mb = 0.0
+# Background RSS sampler; started by main(), stages are tagged by analyzer
+sampler = MemorySampler()
 
 
 def get_memory_mb() -> float:
@@ -33,10 +66,10 @@ def get_memory_mb() -> float:
 
 
 def update_peak() -> float:
-    """Update and return peak memory."""
+    """Update and return peak memory (including peaks seen by the sampler)."""
     global _peak_memory_mb
     current = get_memory_mb()
-    _peak_memory_mb = max(_peak_memory_mb, current)
+    _peak_memory_mb = max(_peak_memory_mb, current, sampler.peak_mb())
     return current
 
 
@@ -54,27 +87,103 @@ def sub(title: str) -> None:
     print(f"\n--- {title} ---")
 
 
-def dist(lf: pl.LazyFrame, col: str, n: int = TOP_N) -> pl.DataFrame:
-    """Print and return distribution for a column."""
-    r = (
-        lf.group_by(col)
-        .agg(pl.len().alias("count"))
-        .sort("count", descending=True)
-        .head(n)
-        .collect()
+def scan(path: Path) -> pl.LazyFrame:
+    """Scan a parquet file; in batch mode the scan is shared by every query.
+
+    Streaming mode skips the shared cache, which would materialize the scan.
+    """
+    lf = pl.scan_parquet(path)
+    return lf.cache() if BATCH and not STREAMING else lf
+
+
+def collect(**queries: pl.LazyFrame | pl.DataFrame) -> dict[str, pl.DataFrame]:
+    """Materialize named queries, in one ``collect_all`` plan run in batch mode.
+
+    Frames that are already computed (e.g. from sketches) are passed through.
+    """
+    lazy = {name: q for name, q in queries.items() if isinstance(q, pl.LazyFrame)}
+    with sampler.stage("collect"):
+        if BATCH:
+            frames = _collect_all(list(lazy.values()))
+        else:
+            frames = [_collect_all([q])[0] for q in lazy.values()]
+    results = dict(zip(lazy, frames))
+    return {name: results.get(name, q) for name, q in queries.items()}
+
+
+def _collect_all(queries: list[pl.LazyFrame]) -> list[pl.DataFrame]:
+    if not STREAMING:
+        return pl.collect_all(queries)
+    try:
+        return pl.collect_all(queries, engine="streaming")
+    except (TypeError, ValueError):
+        # Polars releases without the "streaming" engine name
+        return pl.collect_all(queries, streaming=True)
+
+
+def describe_query(lf: pl.LazyFrame, col: str) -> pl.LazyFrame:
+    """Aggregate-only equivalent of ``Series.describe()`` (see describe_frame)."""
+    c = pl.col(col)
+    stats = [
+        c.count().alias("count"),
+        c.null_count().alias("null_count"),
+        c.mean().alias("mean"),
+        c.std().alias("std"),
+        c.min().alias("min"),
+        *[c.quantile(q, "nearest").alias(f"{q:.0%}") for q in (0.25, 0.5, 0.75)],
+        c.max().alias("max"),
+    ]
+    return lf.select([stat.cast(pl.Float64) for stat in stats])
+
+
+def describe_source(
+    lf: pl.LazyFrame, path: Path, col: str
+) -> pl.LazyFrame | pl.DataFrame:
+    """``describe_query``, or in approximate mode the same row from a KLL sketch."""
+    if APPROX:
+        # numpy/pyarrow are only loaded when sketching
+        from sketches import column_sketch
+
+        return column_sketch(path, col).describe_row()
+    return describe_query(lf, col)
+
+
+def distinct_source(
+    lf: pl.LazyFrame, path: Path, col: str
+) -> pl.LazyFrame | pl.DataFrame:
+    """Distinct count of a column, from a HyperLogLog sketch in approximate mode."""
+    if APPROX:
+        from sketches import column_sketch
+
+        return pl.DataFrame({col: [column_sketch(path, col, "hll").estimate()]})
+    return lf.select(pl.col(col).n_unique())
+
+
+def describe_frame(row: pl.DataFrame) -> pl.DataFrame:
+    """Reshape a ``describe_query`` row into the ``Series.describe()`` layout."""
+    return pl.DataFrame({"statistic": row.columns, "value": list(row.row(0))}).filter(
+        pl.col("value").is_not_null()
     )
-    print(r)
-    return r
 
 
-def desc(lf: pl.LazyFrame, col: str) -> None:
-    """Print describe stats for a column."""
-    print(lf.select(col).collect()[col].describe())
+def dist_query(lf: pl.LazyFrame, col: str, n: int = TOP_N) -> pl.LazyFrame:
+    """Distribution query for a column (top N values by count).
+
+    Ties keep first-appearance order so batched and sequential runs agree.
+    """
+    return (
+        lf.group_by(col, maintain_order=True)
+        .agg(pl.len().alias("count"))
+        .sort("count", descending=True, maintain_order=True)
+        .head(n)
+    )
 
 
-def top(lf: pl.LazyFrame, cols: list[str], sort_col: str, n: int = TOP_N) -> None:
-    """Print top N rows sorted by a column."""
-    print(lf.select(cols).sort(sort_col, descending=True).head(n).collect())
+def top_query(
+    lf: pl.LazyFrame, cols: list[str], sort_col: str, n: int = TOP_N
+) -> pl.LazyFrame:
+    """Top N rows sorted by a column."""
+    return lf.select(cols).sort(sort_col, descending=True, maintain_order=True).head(n)
 
 
 def safe_run(func, name: str) -> dict[str, Any] | None:
@@ -93,16 +202,22 @@ def safe_run(func, name: str) -> dict[str, Any] | None:
 
 def analyze_pm_markets() -> dict[str, Any]:
     header("POLYMARKET: MARKETS")
-    lf = pl.scan_parquet(POLYMARKET_DIR / "soccer_markets.parquet")
-
-    total = lf.select(pl.len()).collect()[0, 0]
-    stats = lf.select(
-        [
-            pl.col("active").sum().alias("active"),
-            pl.col("closed").sum().alias("closed"),
-            pl.col("volume").sum().alias("volume"),
-        ]
-    ).collect()
+    lf = scan(POLYMARKET_DIR / "soccer_markets.parquet")
+
+    r = collect(
+        total=lf.select(pl.len()),
+        stats=lf.select(
+            [
+                pl.col("active").sum().alias("active"),
+                pl.col("closed").sum().alias("closed"),
+                pl.col("volume").sum().alias("volume"),
+            ]
+        ),
+        category=dist_query(lf, "category"),
+        top=top_query(lf, ["question", "volume", "active"], "volume"),
+    )
+    total = r["total"][0, 0]
+    stats = r["stats"]
 
     print(
         f"Total: {total:,} | Active: {stats['active'][0]:,} | Closed: {stats['closed'][0]:,}"
@@ -110,68 +225,76 @@ def analyze_pm_markets() -> dict[str, Any]:
     print(f"Total volume: ${stats['volume'][0]:,.2f}")
 
     sub("Category Distribution")
-    dist(lf, "category")
+    print(r["category"])
 
     sub("Top Markets by Volume")
-    top(lf, ["question", "volume", "active"], "volume")
+    print(r["top"])
 
     return {"total": total, "active": stats["active"][0], "volume": stats["volume"][0]}
 
 
 def analyze_pm_tokens() -> dict[str, Any]:
     header("POLYMARKET: TOKENS")
-    lf = pl.scan_parquet(POLYMARKET_DIR / "soccer_tokens.parquet")
-
-    stats = lf.select(
-        [
-            pl.len().alias("total"),
-            pl.col("market_id").n_unique().alias("markets"),
-            pl.col("token_id").n_unique().alias("tokens"),
-        ]
-    ).collect()
+    lf = scan(POLYMARKET_DIR / "soccer_tokens.parquet")
+
+    r = collect(
+        stats=lf.select(
+            [
+                pl.len().alias("total"),
+                pl.col("market_id").n_unique().alias("markets"),
+                pl.col("token_id").n_unique().alias("tokens"),
+            ]
+        ),
+        outcome=dist_query(lf, "outcome"),
+    )
+    stats = r["stats"]
 
     print(
         f"Total: {stats['total'][0]:,} | Markets: {stats['markets'][0]:,} | Tokens: {stats['tokens'][0]:,}"
     )
 
     sub("Outcome Distribution")
-    dist(lf, "outcome")
+    print(r["outcome"])
 
     return {"total": stats["total"][0], "markets": stats["markets"][0]}
 
 
 def analyze_pm_trades() -> dict[str, Any]:
     header("POLYMARKET: TRADES")
-    lf = pl.scan_parquet(POLYMARKET_DIR / "soccer_trades.parquet").with_columns(
+    path = POLYMARKET_DIR / "soccer_trades.parquet"
+    lf = scan(path).with_columns(
         pl.col("timestamp").cast(pl.Int64).cast(pl.Datetime("ms"))
     )
 
-    stats = lf.select(
-        [
-            pl.len().alias("total"),
-            pl.col("market_id").n_unique().alias("markets"),
-            pl.col("size").sum().alias("size"),
-        ]
-    ).collect()
+    r = collect(
+        stats=lf.select([pl.len().alias("total"), pl.col("size").sum().alias("size")]),
+        markets=distinct_source(lf, path, "market_id"),
+        size=describe_source(lf, path, "size"),
+        price=describe_source(lf, path, "price"),
+        side=dist_query(lf, "side"),
+        times=lf.select(
+            [
+                pl.col("timestamp").min().alias("first"),
+                pl.col("timestamp").max().alias("last"),
+            ]
+        ),
+    )
+    stats = r["stats"]
+    times = r["times"]
+    markets = r["markets"][0, 0]
 
-    print(f"Total trades: {stats['total'][0]:,} | Markets: {stats['markets'][0]:,}")
+    print(f"Total trades: {stats['total'][0]:,} | Markets: {markets:,}")
     print(f"Total size: {stats['size'][0]:,.2f}")
 
     sub("Size Statistics")
-    desc(lf, "size")
+    print(describe_frame(r["size"]))
 
     sub("Price Statistics")
-    desc(lf, "price")
+    print(describe_frame(r["price"]))
 
     sub("Side Distribution")
-    dist(lf, "side")
+    print(r["side"])
 
-    times = lf.select(
-        [
-            pl.col("timestamp").min().alias("first"),
-            pl.col("timestamp").max().alias("last"),
-        ]
-    ).collect()
     print(f"\nDate range: {times['first'][0]} to {times['last'][0]}")
 
     return {"total": stats["total"][0], "size": stats["size"][0]}
@@ -179,67 +302,78 @@ def analyze_pm_trades() -> dict[str, Any]:
 
 def analyze_pm_odds() -> dict[str, Any]:
     header("POLYMARKET: ODDS HISTORY")
-    lf = pl.scan_parquet(POLYMARKET_DIR / "soccer_odds_history.parquet").with_columns(
+    path = POLYMARKET_DIR / "soccer_odds_history.parquet"
+    lf = scan(path).with_columns(
         pl.col("timestamp").cast(pl.Int64).cast(pl.Datetime("ms"))
     )
 
-    stats = lf.select(
-        [
-            pl.len().alias("total"),
-            pl.col("market_id").n_unique().alias("markets"),
-            pl.col("token_id").n_unique().alias("tokens"),
-        ]
-    ).collect()
-
-    print(
-        f"Snapshots: {stats['total'][0]:,} | Markets: {stats['markets'][0]:,} | Tokens: {stats['tokens'][0]:,}"
+    r = collect(
+        total=lf.select(pl.len()),
+        markets=distinct_source(lf, path, "market_id"),
+        tokens=distinct_source(lf, path, "token_id"),
+        price=describe_source(lf, path, "price"),
     )
+    total = r["total"][0, 0]
+    markets = r["markets"][0, 0]
+    tokens = r["tokens"][0, 0]
+
+    print(f"Snapshots: {total:,} | Markets: {markets:,} | Tokens: {tokens:,}")
 
     sub("Price Statistics")
-    desc(lf, "price")
+    print(describe_frame(r["price"]))
 
-    return {"snapshots": stats["total"][0]}
+    return {"snapshots": total}
 
 
 def analyze_pm_events() -> dict[str, Any]:
     header("POLYMARKET: EVENT STATS")
-    lf = pl.scan_parquet(POLYMARKET_DIR / "soccer_event_stats.parquet")
-
-    stats = lf.select(
-        [
-            pl.len().alias("total"),
-            pl.col("market_count").sum().alias("markets"),
-            pl.col("total_volume").sum().alias("volume"),
-        ]
-    ).collect()
+    lf = scan(POLYMARKET_DIR / "soccer_event_stats.parquet")
+
+    r = collect(
+        stats=lf.select(
+            [
+                pl.len().alias("total"),
+                pl.col("market_count").sum().alias("markets"),
+                pl.col("total_volume").sum().alias("volume"),
+            ]
+        ),
+        top=top_query(
+            lf, ["event_slug", "market_count", "total_volume"], "total_volume"
+        ),
+    )
+    stats = r["stats"]
 
     print(f"Events: {stats['total'][0]:,} | Total markets: {stats['markets'][0]:,}")
     print(f"Total volume: ${stats['volume'][0]:,.2f}")
 
     sub("Top Events by Volume")
-    top(lf, ["event_slug", "market_count", "total_volume"], "total_volume")
+    print(r["top"])
 
     return {"events": stats["total"][0], "volume": stats["volume"][0]}
 
 
 def analyze_pm_summary() -> dict[str, Any]:
     header("POLYMARKET: SUMMARY")
-    lf = pl.scan_parquet(POLYMARKET_DIR / "soccer_summary.parquet")
-
-    stats = lf.select(
-        [
-            pl.len().alias("total"),
-            pl.col("trade_count").sum().alias("trades"),
-            pl.col("active").sum().alias("active"),
-        ]
-    ).collect()
+    lf = scan(POLYMARKET_DIR / "soccer_summary.parquet")
+
+    r = collect(
+        stats=lf.select(
+            [
+                pl.len().alias("total"),
+                pl.col("trade_count").sum().alias("trades"),
+                pl.col("active").sum().alias("active"),
+            ]
+        ),
+        top=top_query(lf, ["question", "trade_count", "volume"], "trade_count"),
+    )
+    stats = r["stats"]
 
     print(
         f"Markets: {stats['total'][0]:,} | Trades: {stats['trades'][0]:,} | Active: {stats['active'][0]:,}"
     )
 
     sub("Top Markets by Trades")
-    top(lf, ["question", "trade_count", "volume"], "trade_count")
+    print(r["top"])
 
     return {"markets": stats["total"][0], "trades": stats["trades"][0]}
 
@@ -249,80 +383,93 @@ def analyze_pm_summary() -> dict[str, Any]:
 
 def analyze_sb_matches() -> dict[str, Any]:
     header("STATSBOMB: MATCHES")
-    lf = pl.scan_parquet(STATSBOMB_DIR / "matches.parquet")
+    lf = scan(STATSBOMB_DIR / "matches.parquet")
+
+    results = lf.select(
+        [
+            pl.when(pl.col("home_score") > pl.col("away_score"))
+            .then(pl.lit("Home"))
+            .when(pl.col("away_score") > pl.col("home_score"))
+            .then(pl.lit("Away"))
+            .otherwise(pl.lit("Draw"))
+            .alias("result")
+        ]
+    )
+    r = collect(
+        total=lf.select(pl.len()),
+        competition=dist_query(lf, "competition_name"),
+        season=dist_query(lf, "season_name"),
+        goals=lf.select((pl.col("home_score") + pl.col("away_score")).alias("total")),
+        results=dist_query(results, "result"),
+    )
+    total = r["total"][0, 0]
+    goals = r["goals"]
 
-    total = lf.select(pl.len()).collect()[0, 0]
     print(f"Total matches: {total:,}")
 
     sub("Competition Distribution")
-    dist(lf, "competition_name")
+    print(r["competition"])
 
     sub("Season Distribution")
-    dist(lf, "season_name")
+    print(r["season"])
 
     sub("Score Statistics")
-    goals = lf.select(
-        (pl.col("home_score") + pl.col("away_score")).alias("total")
-    ).collect()
     print(
         f"Goals per match: mean={goals['total'].mean():.2f}, median={goals['total'].median():.1f}"
     )
 
     sub("Match Results")
-    results = lf.select(
-        [
-            pl.when(pl.col("home_score") > pl.col("away_score"))
-            .then(pl.lit("Home"))
-            .when(pl.col("away_score") > pl.col("home_score"))
-            .then(pl.lit("Away"))
-            .otherwise(pl.lit("Draw"))
-            .alias("result")
-        ]
-    )
-    dist(results, "result")
+    print(r["results"])
 
     return {"matches": total}
 
 
 def analyze_sb_events() -> dict[str, Any]:
     header("STATSBOMB: EVENTS")
-    lf = pl.scan_parquet(STATSBOMB_DIR / "events.parquet")
-
-    stats = lf.select(
-        [
-            pl.len().alias("total"),
-            pl.col("match_id").n_unique().alias("matches"),
-            pl.col("type").n_unique().alias("types"),
-        ]
-    ).collect()
+    lf = scan(STATSBOMB_DIR / "events.parquet")
+
+    r = collect(
+        stats=lf.select(
+            [
+                pl.len().alias("total"),
+                pl.col("match_id").n_unique().alias("matches"),
+                pl.col("type").n_unique().alias("types"),
+            ]
+        ),
+        types=dist_query(lf, "type", 15),
+        shots=lf.filter(pl.col("type") == "Shot").select(pl.len()),
+        passes=lf.filter(pl.col("type") == "Pass").select(
+            [
+                pl.len().alias("total"),
+                pl.col("pass_outcome").is_null().sum().alias("successful"),
+            ]
+        ),
+        players=top_query(
+            lf.group_by("player", maintain_order=True).agg(pl.len().alias("count")),
+            ["player", "count"],
+            "count",
+        ),
+    )
+    stats = r["stats"]
+    shot_count = r["shots"][0, 0]
+    pass_stats = r["passes"]
 
     print(
         f"Events: {stats['total'][0]:,} | Matches: {stats['matches'][0]:,} | Types: {stats['types'][0]:,}"
     )
 
     sub("Event Type Distribution")
-    dist(lf, "type", 15)
+    print(r["types"])
 
     sub("Shot Analysis")
-    shots = lf.filter(pl.col("type") == "Shot")
-    shot_count = shots.select(pl.len()).collect()[0, 0]
     print(f"Total shots: {shot_count:,}")
 
     sub("Pass Analysis")
-    passes = lf.filter(pl.col("type") == "Pass")
-    pass_stats = passes.select(
-        [
-            pl.len().alias("total"),
-            pl.col("pass_outcome").is_null().sum().alias("successful"),
-        ]
-    ).collect()
     pct = pass_stats["successful"][0] / pass_stats["total"][0] * 100
     print(f"Passes: {pass_stats['total'][0]:,} | Success rate: {pct:.1f}%")
 
     sub("Most Active Players")
-    top(
-        lf.group_by("player").agg(pl.len().alias("count")), ["player", "count"], "count"
-    )
+    print(r["players"])
 
     return {
         "events": stats["total"][0],
@@ -333,26 +480,29 @@ def analyze_sb_events() -> dict[str, Any]:
 
 def analyze_sb_lineups() -> dict[str, Any]:
     header("STATSBOMB: LINEUPS")
-    lf = pl.scan_parquet(STATSBOMB_DIR / "lineups.parquet")
-
-    stats = lf.select(
-        [
-            pl.len().alias("total"),
-            pl.col("match_id").n_unique().alias("matches"),
-            pl.col("player_name").n_unique().alias("players"),
-        ]
-    ).collect()
+    lf = scan(STATSBOMB_DIR / "lineups.parquet")
+
+    r = collect(
+        stats=lf.select(
+            [
+                pl.len().alias("total"),
+                pl.col("match_id").n_unique().alias("matches"),
+                pl.col("player_name").n_unique().alias("players"),
+            ]
+        ),
+        positions=dist_query(lf, "position_name"),
+        cards=lf.filter(pl.col("card_type").is_not_null()).select(pl.len()),
+    )
+    stats = r["stats"]
+    cards = r["cards"][0, 0]
 
     print(
         f"Records: {stats['total'][0]:,} | Matches: {stats['matches'][0]:,} | Players: {stats['players'][0]:,}"
     )
 
     sub("Position Distribution")
-    dist(lf, "position_name")
+    print(r["positions"])
 
-    cards = (
-        lf.filter(pl.col("card_type").is_not_null()).select(pl.len()).collect()[0, 0]
-    )
     print(f"\nTotal cards: {cards:,}")
 
     return {
@@ -364,38 +514,47 @@ def analyze_sb_lineups() -> dict[str, Any]:
 
 def analyze_sb_360() -> dict[str, Any]:
     header("STATSBOMB: THREE SIXTY")
-    lf = pl.scan_parquet(STATSBOMB_DIR / "three_sixty.parquet")
-
-    stats = lf.select(
-        [
-            pl.len().alias("total"),
-            pl.col("event_uuid").n_unique().alias("events"),
-            pl.col("match_id").n_unique().alias("matches"),
-        ]
-    ).collect()
+    path = STATSBOMB_DIR / "three_sixty.parquet"
+    lf = scan(path)
+
+    r = collect(
+        stats=lf.select(
+            [
+                pl.len().alias("total"),
+                pl.col("match_id").n_unique().alias("matches"),
+            ]
+        ),
+        events=distinct_source(lf, path, "event_uuid"),
+        x=describe_source(lf, path, "location_x"),
+        y=describe_source(lf, path, "location_y"),
+    )
+    stats = r["stats"]
+    events = r["events"][0, 0]
 
     print(
-        f"Records: {stats['total'][0]:,} | Events: {stats['events'][0]:,} | Matches: {stats['matches'][0]:,}"
+        f"Records: {stats['total'][0]:,} | Events: {events:,} | Matches: {stats['matches'][0]:,}"
     )
 
     sub("Spatial Distribution")
     print("X coords:")
-    desc(lf, "location_x")
+    print(describe_frame(r["x"]))
     print("\nY coords:")
-    desc(lf, "location_y")
+    print(describe_frame(r["y"]))
 
-    return {"records": stats["total"][0], "events": stats["events"][0]}
+    return {"records": stats["total"][0], "events": events}
 
 
 def analyze_sb_reference() -> dict[str, Any]:
     header("STATSBOMB: REFERENCE")
-    lf = pl.scan_parquet(STATSBOMB_DIR / "reference.parquet")
+    lf = scan(STATSBOMB_DIR / "reference.parquet")
+
+    r = collect(total=lf.select(pl.len()), tables=dist_query(lf, "table_name"))
+    total = r["total"][0, 0]
 
-    total = lf.select(pl.len()).collect()[0, 0]
     print(f"Total records: {total:,}")
 
     sub("Entity Types")
-    dist(lf, "table_name")
+    print(r["tables"])
 
     return {"records": total}
 
@@ -403,23 +562,27 @@ def analyze_sb_reference() -> dict[str, Any]:
 def cross_analysis() -> dict[str, Any]:
     header("CROSS-DATASET ANALYSIS")
 
-    pm = pl.scan_parquet(POLYMARKET_DIR / "soccer_markets.parquet")
-    sb = pl.scan_parquet(STATSBOMB_DIR / "matches.parquet")
-
-    pm_stats = pm.select(
-        [
-            pl.len().alias("n"),
-            pl.col("created_at").min().alias("min"),
-            pl.col("created_at").max().alias("max"),
-        ]
-    ).collect()
-    sb_stats = sb.select(
-        [
-            pl.len().alias("n"),
-            pl.col("match_date").min().alias("min"),
-            pl.col("match_date").max().alias("max"),
-        ]
-    ).collect()
+    pm = scan(POLYMARKET_DIR / "soccer_markets.parquet")
+    sb = scan(STATSBOMB_DIR / "matches.parquet")
+
+    r = collect(
+        pm=pm.select(
+            [
+                pl.len().alias("n"),
+                pl.col("created_at").min().alias("min"),
+                pl.col("created_at").max().alias("max"),
+            ]
+        ),
+        sb=sb.select(
+            [
+                pl.len().alias("n"),
+                pl.col("match_date").min().alias("min"),
+                pl.col("match_date").max().alias("max"),
+            ]
+        ),
+    )
+    pm_stats = r["pm"]
+    sb_stats = r["sb"]
 
     print(
         f"Polymarket: {pm_stats['n'][0]:,} markets ({pm_stats['min'][0]} to {pm_stats['max'][0]})"
@@ -428,60 +591,564 @@ def cross_analysis() -> dict[str, Any]:
         f"Statsbomb: {sb_stats['n'][0]:,} matches ({sb_stats['min'][0]} to {sb_stats['max'][0]})"
     )
 
+    from parquet_inventory import inventory
+
     sub("File Sizes")
     for name, dir_path in [
         ("Polymarket", POLYMARKET_DIR),
         ("Statsbomb", STATSBOMB_DIR),
     ]:
         print(f"\n{name}:")
-        for f in dir_path.glob("*.parquet"):
-            count = pl.scan_parquet(f).select(pl.len()).collect()[0, 0]
-            print(f"  {f.name}: {count:,}")
+        # Row counts and sizes come from the parquet footers only
+        for info in inventory([dir_path]):
+            print(
+                f"  {Path(info.path).name}: {info.rows:,} rows | "
+                f"{info.row_groups} row groups | {info.file_bytes / 1024**2:,.2f} MB"
+                f" | {info.ratio:.2f}x compression"
+            )
 
     return {"pm_markets": pm_stats["n"][0], "sb_matches": sb_stats["n"][0]}
 
 
+PM_ANALYZERS = [
+    analyze_pm_markets,
+    analyze_pm_tokens,
+    analyze_pm_trades,
+    analyze_pm_odds,
+    analyze_pm_events,
+    analyze_pm_summary,
+]
+SB_ANALYZERS = [
+    analyze_sb_matches,
+    analyze_sb_events,
+    analyze_sb_lineups,
+    analyze_sb_360,
+    analyze_sb_reference,
+]
+
+
+def available_analyzers() -> list:
+    """Analyzers whose input directories exist, in report order."""
+    analyzers = []
+    if POLYMARKET_DIR.exists():
+        analyzers += PM_ANALYZERS
+    if STATSBOMB_DIR.exists():
+        analyzers += SB_ANALYZERS
+    if POLYMARKET_DIR.exists() and STATSBOMB_DIR.exists():
+        analyzers.append(cross_analysis)
+    return analyzers
+
+
+def read_bytes() -> int | None:
+    """Bytes read by this process so far (all I/O syscalls, incl. page cache).
+
+    None where psutil has no I/O counters (e.g. macOS).
+    """
+    if not hasattr(_process, "io_counters"):
+        return None
+    counters = _process.io_counters()
+    return getattr(counters, "read_chars", counters.read_bytes)
+
+
+def _mb(value: int | None) -> str:
+    return "n/a" if value is None else f"{value / 1024**2:.2f}"
+
+
+def compare_modes() -> None:
+    """Run each analyzer sequentially and batched; report time and bytes read."""
+    global BATCH
+
+    header("BATCH VS SEQUENTIAL")
+    print(
+        f"{'analyzer':<24}{'seq ms':>10}{'batch ms':>10}{'seq MB':>10}{'batch MB':>10}"
+        "  output"
+    )
+    totals = [0.0, 0.0, 0, 0]
+    mismatched = []
+    for fn in available_analyzers():
+        row = []
+        outputs = []
+        for batch in (False, True):
+            BATCH = batch
+            buf = io.StringIO()
+            start_bytes = read_bytes()
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(buf):
+                safe_run(fn, fn.__name__)
+            row.append((time.perf_counter() - start) * 1000)
+            end_bytes = read_bytes()
+            row.append(None if end_bytes is None else end_bytes - start_bytes)
+            outputs.append(buf.getvalue())
+        seq_ms, seq_bytes, batch_ms, batch_bytes = row
+        same = outputs[0] == outputs[1]
+        if not same:
+            mismatched.append(fn.__name__)
+        for i, value in enumerate((seq_ms, batch_ms, seq_bytes, batch_bytes)):
+            totals[i] = None if value is None else totals[i] + value
+        print(
+            f"{fn.__name__:<24}{seq_ms:>10.1f}{batch_ms:>10.1f}"
+            f"{_mb(seq_bytes):>10}{_mb(batch_bytes):>10}"
+            f"  {'same' if same else 'DIFFERS'}"
+        )
+    BATCH = True
+    print(
+        f"{'TOTAL':<24}{totals[0]:>10.1f}{totals[1]:>10.1f}"
+        f"{_mb(totals[2]):>10}{_mb(totals[3]):>10}"
+    )
+    if mismatched:
+        raise SystemExit(f"Output differs between modes: {', '.join(mismatched)}")
+
+
+# ============ RESULT CACHE ============
+
+ANALYZER_INPUTS = {
+    "analyze_pm_markets": [POLYMARKET_DIR / "soccer_markets.parquet"],
+    "analyze_pm_tokens": [POLYMARKET_DIR / "soccer_tokens.parquet"],
+    "analyze_pm_trades": [POLYMARKET_DIR / "soccer_trades.parquet"],
+    "analyze_pm_odds": [POLYMARKET_DIR / "soccer_odds_history.parquet"],
+    "analyze_pm_events": [POLYMARKET_DIR / "soccer_event_stats.parquet"],
+    "analyze_pm_summary": [POLYMARKET_DIR / "soccer_summary.parquet"],
+    "analyze_sb_matches": [STATSBOMB_DIR / "matches.parquet"],
+    "analyze_sb_events": [STATSBOMB_DIR / "events.parquet"],
+    "analyze_sb_lineups": [STATSBOMB_DIR / "lineups.parquet"],
+    "analyze_sb_360": [STATSBOMB_DIR / "three_sixty.parquet"],
+    "analyze_sb_reference": [STATSBOMB_DIR / "reference.parquet"],
+}
+_hash_index: dict[str, tuple[int, int, str]] | None = None
+_shared_code_hash: str | None = None
+
+
+def analyzer_inputs(fn) -> list[Path]:
+    """Input files of an analyzer (cross_analysis reads every parquet file)."""
+    if fn.__name__ in ANALYZER_INPUTS:
+        return ANALYZER_INPUTS[fn.__name__]
+    return sorted([*POLYMARKET_DIR.glob("*.parquet"), *STATSBOMB_DIR.glob("*.parquet")])
+
+
+def _write_atomic(path: Path, obj: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+    os.replace(tmp, path)
+
+
+def file_hash(path: Path) -> tuple[int, int, str]:
+    """(size, mtime_ns, sha256) of a file; rehashed only if size or mtime changed."""
+    global _hash_index
+    index_path = CACHE_DIR / "file_hashes.pkl"
+    if _hash_index is None:
+        try:
+            _hash_index = pickle.loads(index_path.read_bytes())
+        except (FileNotFoundError, pickle.UnpicklingError, EOFError):
+            _hash_index = {}
+    stat = path.stat()
+    entry = _hash_index.get(str(path))
+    if entry is not None and entry[:2] == (stat.st_size, stat.st_mtime_ns):
+        return entry
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+    entry = (stat.st_size, stat.st_mtime_ns, digest.hexdigest())
+    _hash_index[str(path)] = entry
+    _write_atomic(index_path, _hash_index)
+    return entry
+
+
+def shared_code_hash() -> str:
+    """Hash of the code every analyzer shares.
+
+    That is this module with the analyzer functions cut out, plus the local
+    helper modules, so an edit to ``collect``, ``describe_query`` or a sketch
+    invalidates every cached result while an edit to one analyzer only
+    invalidates its own.
+    """
+    global _shared_code_hash
+    if _shared_code_hash is None:
+        source = Path(__file__).read_text()
+        for fn in [*PM_ANALYZERS, *SB_ANALYZERS, cross_analysis]:
+            source = source.replace(inspect.getsource(fn), "")
+        here = Path(__file__).parent
+        parts = [source, *((here / name).read_text() for name in CACHE_HELPER_MODULES)]
+        _shared_code_hash = hashlib.sha256("\0".join(parts).encode()).hexdigest()
+    return _shared_code_hash
+
+
+def cache_key(fn) -> str | None:
+    """Key of an analyzer's code version and inputs; None if an input is missing.
+
+    Inputs enter the key by name, size and content hash, so touching a file
+    without changing it costs one rehash but keeps the cached result.
+    """
+    try:
+        files = []
+        for path in analyzer_inputs(fn):
+            size, _, digest = file_hash(path)
+            files.append((path.name, size, digest))
+    except FileNotFoundError:
+        return None
+    code = (shared_code_hash(), inspect.getsource(fn))
+    payload = repr((code, BATCH, APPROX, files))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def load_cached(fn) -> tuple[str, dict[str, Any]] | None:
+    """Return the cached (output, result) of an analyzer, if still valid."""
+    key = cache_key(fn)
+    if key is None:
+        return None
+    try:
+        entry = pickle.loads((CACHE_DIR / f"{fn.__name__}.pkl").read_bytes())
+    except (FileNotFoundError, pickle.UnpicklingError, EOFError):
+        return None
+    if entry.get("key") != key:
+        return None
+    return entry["output"], entry["result"]
+
+
+def store_cached(fn, output: str, result: dict[str, Any] | None) -> None:
+    """Cache a successful analyzer run (skipped and failed runs are not kept)."""
+    key = cache_key(fn)
+    if result is None or key is None:
+        return
+    _write_atomic(
+        CACHE_DIR / f"{fn.__name__}.pkl",
+        {"key": key, "output": output, "result": result},
+    )
+
+
+def run_cached(fn) -> dict[str, Any] | None:
+    """Run an analyzer in-process, replaying its cached output when valid."""
+    with sampler.stage(fn.__name__):
+        return _run_cached(fn)
+
+
+def _run_cached(fn) -> dict[str, Any] | None:
+    cached = load_cached(fn) if USE_CACHE else None
+    if cached is not None:
+        output, result = cached
+    elif MAX_MEMORY is not None:
+        run = run_budgeted(fn, MAX_MEMORY, BATCH)
+        output, result = run.output, run.result
+    else:
+        buf = io.StringIO()
+        with contextlib.redirect_stdout(buf):
+            result = safe_run(fn, fn.__name__)
+        output = buf.getvalue()
+    print(output, end="")
+    if cached is None and USE_CACHE:
+        store_cached(fn, output, result)
+    return result
+
+
+# ============ PARALLEL SCHEDULER ============
+
+
+@dataclass
+class AnalyzerRun:
+    """Captured output, result and resource usage of one analyzer."""
+
+    name: str
+    output: str
+    result: dict[str, Any] | None
+    wall_s: float
+    cpu_s: float
+    peak_rss_mb: float
+    cached: bool = False
+
+
+def peak_rss_mb() -> float:
+    """High-water mark of this process's RSS in MB."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        info = _process.memory_info()
+        return getattr(info, "peak_wset", info.rss) / 1024**2
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+def run_captured(
+    fn, batch: bool = True, approx: bool = False, streaming: bool = False
+) -> AnalyzerRun:
+    """Run one analyzer, capturing its output and resource usage.
+
+    Meant to run in a fresh worker process, so CPU time and peak RSS belong
+    to this analyzer alone (plus the interpreter and Polars import).
+    """
+    global APPROX, BATCH, STREAMING
+    BATCH = batch
+    APPROX = approx
+    STREAMING = streaming
+    buf = io.StringIO()
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    with contextlib.redirect_stdout(buf):
+        result = safe_run(fn, fn.__name__)
+    return AnalyzerRun(
+        name=fn.__name__,
+        output=buf.getvalue(),
+        result=result,
+        wall_s=time.perf_counter() - start_wall,
+        cpu_s=time.process_time() - start_cpu,
+        peak_rss_mb=peak_rss_mb(),
+    )
+
+
+def run_parallel(analyzers: list, jobs: int, batch: bool = True) -> list[AnalyzerRun]:
+    """Run analyzers concurrently, one fresh process each, printing in order.
+
+    Output is buffered per analyzer and printed in submission order as soon as
+    every earlier analyzer has finished, so the console matches a serial run.
+    Polars threads are split across workers unless POLARS_MAX_THREADS is set.
+    Analyzers with a valid cache entry are replayed without a worker.
+    """
+    previous = os.environ.get("POLARS_MAX_THREADS")
+    if previous is None:
+        os.environ["POLARS_MAX_THREADS"] = str(max(1, (os.cpu_count() or 1) // jobs))
+    runs = []
+    try:
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            mp_context=multiprocessing.get_context("spawn"),
+            max_tasks_per_child=1,
+        ) as pool:
+            cached = {fn: load_cached(fn) if USE_CACHE else None for fn in analyzers}
+            futures = {
+                fn: pool.submit(run_captured, fn, batch, APPROX, STREAMING)
+                for fn in analyzers
+                if cached[fn] is None
+            }
+            for fn in analyzers:
+                if cached[fn] is not None:
+                    output, result = cached[fn]
+                    run = AnalyzerRun(fn.__name__, output, result, 0, 0, 0, cached=True)
+                    print(run.output, end="", flush=True)
+                    runs.append(run)
+                    continue
+                try:
+                    run = futures[fn].result()
+                except Exception as e:
+                    run = AnalyzerRun(
+                        fn.__name__, f"\n[ERROR] {fn.__name__}: {e}\n", None, 0, 0, 0
+                    )
+                if USE_CACHE:
+                    store_cached(fn, run.output, run.result)
+                print(run.output, end="", flush=True)
+                runs.append(run)
+    finally:
+        if previous is None:
+            os.environ.pop("POLARS_MAX_THREADS", None)
+    return runs
+
+
+def resource_report(runs: list[AnalyzerRun], wall_s: float) -> None:
+    """Print wall time, CPU time and peak RSS per analyzer."""
+    header("ANALYZER RESOURCES")
+    print(f"{'analyzer':<24}{'wall s':>9}{'cpu s':>9}{'peak RSS MB':>13}")
+    for run in runs:
+        if run.cached:
+            print(f"{run.name:<24}{'cached':>9}")
+            continue
+        print(
+            f"{run.name:<24}{run.wall_s:>9.2f}{run.cpu_s:>9.2f}{run.peak_rss_mb:>13.1f}"
+        )
+    total = sum(run.wall_s for run in runs)
+    slowest = max((run.wall_s for run in runs), default=0.0)
+    print(
+        f"\nTotal wall: {wall_s:.2f}s | Sum of analyzers: {total:.2f}s"
+        f" | Slowest analyzer: {slowest:.2f}s"
+    )
+
+
+# ============ MEMORY BUDGET ============
+
+
+def parse_size(text: str) -> int:
+    """Parse a size such as ``1GB``, ``512MB`` or ``1.5G`` into bytes."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMGT]?)I?B?\s*", text.upper())
+    if match is None:
+        raise ValueError(f"invalid size: {text!r}")
+    value, unit = match.groups()
+    return int(float(value) * 1024 ** " KMGT".index(unit or " "))
+
+
+def _budget_worker(fn, batch: bool, streaming: bool, approx: bool, conn) -> None:
+    conn.send(run_captured(fn, batch, approx, streaming))
+    conn.close()
+
+
+def run_budgeted(fn, max_bytes: int, batch: bool = True) -> AnalyzerRun:
+    """Run one analyzer in a watched subprocess, killed if its RSS exceeds max_bytes.
+
+    The parent polls the worker's RSS every 20 ms; on overrun the worker is
+    killed and the analyzer fails with a clear error instead of taking the
+    machine (or CI runner) into the OOM killer.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    recv, send = ctx.Pipe(duplex=False)
+    proc = ctx.Process(
+        target=_budget_worker,
+        args=(fn, batch, STREAMING, APPROX, send),
+        daemon=True,
+    )
+    start = time.perf_counter()
+    proc.start()
+    send.close()
+    watched = psutil.Process(proc.pid)
+    peak = 0
+    error = None
+    try:
+        while not recv.poll(0.02):
+            try:
+                rss = watched.memory_info().rss
+            except psutil.NoSuchProcess:
+                rss = 0
+            peak = max(peak, rss)
+            sampler.record(rss)
+            if rss > max_bytes:
+                proc.kill()
+                error = (
+                    f"exceeded the memory budget of {max_bytes / 1024**2:,.0f} MB "
+                    f"(RSS reached {rss / 1024**2:,.0f} MB) and was stopped; "
+                    "raise --max-memory or reduce the input size"
+                )
+                break
+            if not proc.is_alive():
+                break
+        if error is None:
+            try:
+                run = recv.recv()
+                # The worker's own high-water mark catches spikes between polls
+                sampler.record(int(run.peak_rss_mb * 1024**2))
+                return run
+            except EOFError:
+                error = f"worker exited with code {proc.exitcode}"
+    finally:
+        proc.join()
+        recv.close()
+    return AnalyzerRun(
+        fn.__name__,
+        f"\n[ERROR] {fn.__name__}: {error}\n",
+        None,
+        time.perf_counter() - start,
+        0.0,
+        peak / 1024**2,
+    )
+
+
 def main() -> None:
-    global _peak_memory_mb
+    import argparse
+
+    global APPROX, BATCH, MAX_MEMORY, STREAMING, USE_CACHE, _peak_memory_mb
+    parser = argparse.ArgumentParser(description="Run the soccer analytics EDA.")
+    parser.add_argument(
+        "--sequential",
+        action="store_true",
+        help="Collect each query on its own instead of one batched plan",
+    )
+    parser.add_argument(
+        "--compare",
+        action="store_true",
+        help="Run every analyzer in both modes and report time and bytes read",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Run analyzers concurrently on this many worker processes",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Recompute every analyzer instead of replaying cached results",
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Run queries on the Polars streaming engine",
+    )
+    parser.add_argument(
+        "--max-memory",
+        type=parse_size,
+        help="Cap each analyzer's RSS (e.g. 1GB); implies --streaming",
+    )
+    parser.add_argument(
+        "--approx",
+        action="store_true",
+        help="Use sketches for describe/distinct stats on the largest files",
+    )
+    parser.add_argument(
+        "--sample-interval",
+        type=float,
+        default=10.0,
+        help="Memory sampling interval in milliseconds",
+    )
+    parser.add_argument(
+        "--memory-trace",
+        type=Path,
+        help="Write the memory timeline as a Chrome trace JSON file",
+    )
+    args = parser.parse_args()
+    if args.max_memory is not None and args.jobs > 1:
+        parser.error("--max-memory runs analyzers one at a time; drop --jobs")
+    USE_CACHE = not args.no_cache
+    STREAMING = args.streaming or args.max_memory is not None
+    MAX_MEMORY = args.max_memory
+    APPROX = args.approx
+    if args.compare:
+        compare_modes()
+        return
+    BATCH = not args.sequential
+
+    if args.jobs > 1:
+        header("SOCCER ANALYTICS EDA (V2)")
+        if not POLYMARKET_DIR.exists():
+            print("\n[SKIP] Polymarket directory not found")
+        if not STATSBOMB_DIR.exists():
+            print("\n[ERROR] Statsbomb directory not found")
+        start = time.perf_counter()
+        runs = run_parallel(available_analyzers(), args.jobs, BATCH)
+        resource_report(runs, time.perf_counter() - start)
+        return
+
     _peak_memory_mb = get_memory_mb()  # Initialize with baseline
     baseline = _peak_memory_mb
+    sampler.interval = args.sample_interval / 1000
+    sampler.start()
 
     header("SOCCER ANALYTICS EDA (V2)")
     print(f"Baseline memory: {baseline:.1f} MB")
 
     if POLYMARKET_DIR.exists():
-        for fn in [
-            analyze_pm_markets,
-            analyze_pm_tokens,
-            analyze_pm_trades,
-            analyze_pm_odds,
-            analyze_pm_events,
-            analyze_pm_summary,
-        ]:
-            safe_run(fn, fn.__name__)
+        for fn in PM_ANALYZERS:
+            run_cached(fn)
             update_peak()
         print(f"\n[Polymarket complete] {mem_report()}")
     else:
         print("\n[SKIP] Polymarket directory not found")
 
     if STATSBOMB_DIR.exists():
-        for fn in [
-            analyze_sb_matches,
-            analyze_sb_events,
-            analyze_sb_lineups,
-            analyze_sb_360,
-            analyze_sb_reference,
-        ]:
-            safe_run(fn, fn.__name__)
+        for fn in SB_ANALYZERS:
+            run_cached(fn)
             update_peak()
         print(f"\n[Statsbomb complete] {mem_report()}")
     else:
         print("\n[ERROR] Statsbomb directory not found")
 
     if POLYMARKET_DIR.exists() and STATSBOMB_DIR.exists():
-        safe_run(cross_analysis, "cross_analysis")
+        run_cached(cross_analysis)
         update_peak()
 
+    sampler.stop()
+    update_peak()
+    header("STAGE MEMORY (sampled every {:g} ms)".format(args.sample_interval))
+    sampler.report()
+    if args.memory_trace:
+        sampler.write_trace(args.memory_trace)
+        print(f"\nMemory trace written to {args.memory_trace}")
+
     header("EDA COMPLETE")
     final = get_memory_mb()
     print(f"Baseline memory: {baseline:.2f} MB")
@@ -0,0 +1,244 @@
+"""
+Declarative count features compiled into a single group-by.
+
+A spec is a list of ``CountFeature`` entries, each counting the rows where
+one column takes given values. The whole spec compiles into one aggregation
+at the chosen grain, in Polars (one filtered ``sum`` per output column
+inside a single ``group_by``) or DuckDB (one ``COUNT(*) FILTER (...)`` per
+column in a single ``GROUP BY``), so a wide table is built in one scan
+instead of through hand-written indicator columns:
+
+    SPEC = [
+        CountFeature("type", {"Pass": "passes", "Shot": "shots"}),
+        CountFeature("pass_height"),  # one column per value found in the data
+    ]
+    features = polars_features(pl.scan_parquet(EVENTS_PATH), SPEC, "team_match")
+
+Adding a feature is adding an entry (or a value) to the spec.
+
+Usage:
+    python eda/feature_spec.py                              # team-match, Polars
+    python eda/feature_spec.py --grain player_match --engine duckdb
+    python eda/feature_spec.py --grain possession --output counts.parquet
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+import duckdb
+import polars as pl
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+EVENTS_PATH = DATA_DIR / "Statsbomb" / "events.parquet"
+
+# Grain -> group-by keys
+GRAINS = {
+    "possession": [
+        "match_id",
+        "period",
+        "possession",
+        "possession_team_id",
+        "play_pattern",
+    ],
+    "player_match": ["match_id", "team_id", "player_id"],
+    "team_match": ["match_id", "team_id"],
+}
+
+
+def slug(value: str) -> str:
+    """Column-name-safe value, e.g. 'Ball Receipt*' -> 'ball_receipt'."""
+    return re.sub(r"[^0-9a-z]+", "_", str(value).lower()).strip("_") or "value"
+
+
+@dataclass
+class CountFeature:
+    """Count rows per group where ``column`` equals each of ``values``.
+
+    ``values`` maps value -> output column name; a list uses
+    ``<column>_<value>`` names, and ``None`` means every value in the data
+    (see ``resolve``).
+    """
+
+    column: str
+    values: dict[str, str] | Sequence[str] | None = None
+    prefix: str | None = None
+
+    def __post_init__(self) -> None:
+        if self.values is not None:
+            check_outputs([self])
+
+    def outputs(self) -> list[tuple[str, str]]:
+        """(value, output column) pairs; the values must be known."""
+        if self.values is None:
+            raise ValueError(f"Values of {self.column!r} are not resolved yet")
+        if isinstance(self.values, dict):
+            return list(self.values.items())
+        prefix = self.prefix or self.column
+        return [(value, f"{prefix}_{slug(value)}") for value in self.values]
+
+
+def check_outputs(spec: Iterable[CountFeature]) -> list[tuple[str, str, str]]:
+    """(column, value, output column) of every feature in ``spec``.
+
+    Raises ``ValueError`` if two values end up with the same output column,
+    e.g. 'Foul Won' and 'Foul-Won' both slugging to ``type_foul_won``.
+    """
+    outputs = [
+        (feature.column, value, name)
+        for feature in spec
+        for value, name in feature.outputs()
+    ]
+    sources: dict[str, list[str]] = {}
+    for column, value, name in outputs:
+        sources.setdefault(name, []).append(f"{column}={value!r}")
+    clashes = {name: found for name, found in sources.items() if len(found) > 1}
+    if clashes:
+        details = "; ".join(
+            f"{name} <- {', '.join(found)}" for name, found in clashes.items()
+        )
+        raise ValueError(
+            f"Count features share output columns ({details}); "
+            "map the values to distinct names or use a different prefix"
+        )
+    return outputs
+
+
+def feature_names(spec: Iterable[CountFeature]) -> list[str]:
+    return [name for _, _, name in check_outputs(spec)]
+
+
+def resolve(spec: Sequence[CountFeature], events: pl.LazyFrame) -> list[CountFeature]:
+    """Fill in ``values=None`` features with the values present in ``events``.
+
+    All open columns are read in one extra (distinct-only) query.
+    """
+    open_columns = list(dict.fromkeys(f.column for f in spec if f.values is None))
+    if not open_columns:
+        return list(spec)
+    found = pl.collect_all(
+        [
+            events.select(pl.col(column).drop_nulls().unique().sort())
+            for column in open_columns
+        ]
+    )
+    values = {
+        column: frame.to_series().to_list()
+        for column, frame in zip(open_columns, found)
+    }
+    resolved = [
+        CountFeature(f.column, values[f.column], f.prefix) if f.values is None else f
+        for f in spec
+    ]
+    check_outputs(resolved)
+    return resolved
+
+
+# ============ POLARS ============
+
+
+def count_exprs(spec: Iterable[CountFeature]) -> list[pl.Expr]:
+    """One aggregation expression per output column."""
+    return [
+        (pl.col(column) == value).fill_null(False).sum().alias(name)
+        for column, value, name in check_outputs(spec)
+    ]
+
+
+def polars_features(
+    events: pl.LazyFrame,
+    spec: Sequence[CountFeature],
+    grain: str = "team_match",
+    extra: Iterable[pl.Expr] = (),
+) -> pl.LazyFrame:
+    """Wide count table at ``grain``; ``extra`` adds aggregations to the same pass."""
+    keys = GRAINS[grain]
+    spec = resolve(spec, events)
+    return (
+        events.filter(pl.all_horizontal(pl.col(keys).is_not_null()))
+        .group_by(keys)
+        .agg(*count_exprs(spec), *extra)
+        .sort(keys)
+    )
+
+
+# ============ DUCKDB ============
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _literal(value: object) -> str:
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    return str(value)
+
+
+def duckdb_sql(
+    source: str, spec: Iterable[CountFeature], grain: str = "team_match"
+) -> str:
+    """A single GROUP BY over ``source`` (a table, view or ``read_parquet(...)``)."""
+    keys = ", ".join(_quote(key) for key in GRAINS[grain])
+    counts = ",\n    ".join(
+        f"COUNT(*) FILTER (WHERE {_quote(column)} = {_literal(value)}) "
+        f"AS {_quote(name)}"
+        for column, value, name in check_outputs(spec)
+    )
+    not_null = " AND ".join(f"{_quote(key)} IS NOT NULL" for key in GRAINS[grain])
+    return (
+        f"SELECT {keys},\n    {counts}\nFROM {source}\nWHERE {not_null}\n"
+        f"GROUP BY {keys}\nORDER BY {keys}"
+    )
+
+
+def duckdb_features(
+    spec: Sequence[CountFeature],
+    grain: str = "team_match",
+    events_path: Path = EVENTS_PATH,
+    con: duckdb.DuckDBPyConnection | None = None,
+) -> pl.DataFrame:
+    """Wide count table at ``grain`` computed by DuckDB."""
+    con = con if con is not None else duckdb.connect()
+    source = f"read_parquet('{Path(events_path).as_posix()}')"
+    spec = resolve(spec, pl.scan_parquet(events_path))
+    return con.sql(duckdb_sql(source, spec, grain)).pl()
+
+
+# ============ DEFAULT SPEC ============
+
+DEFAULT_SPEC = [
+    CountFeature("type"),
+    CountFeature("pass_height"),
+    CountFeature("pass_body_part"),
+    CountFeature("pass_technique"),
+]
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Build a wide event-count table.")
+    parser.add_argument("--grain", choices=GRAINS, default="team_match")
+    parser.add_argument("--engine", choices=["polars", "duckdb"], default="polars")
+    parser.add_argument("--events", type=Path, default=EVENTS_PATH)
+    parser.add_argument("--output", type=Path, help="Write parquet instead of printing")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.engine == "duckdb":
+        table = duckdb_features(DEFAULT_SPEC, args.grain, args.events)
+    else:
+        events = pl.scan_parquet(args.events)
+        table = polars_features(events, DEFAULT_SPEC, args.grain).collect()
+    elapsed = time.perf_counter() - start
+    if args.output:
+        table.write_parquet(args.output)
+        print(f"Wrote {args.output}")
+    else:
+        print(table)
+    print(f"{table.height:,} rows x {table.width} columns in {elapsed:.2f}s")
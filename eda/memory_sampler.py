@@ -0,0 +1,191 @@
+"""
+Background RSS sampler with per-stage peak attribution.
+
+A daemon thread records the process RSS at a fixed interval and tags every
+sample with the stage that is running (stages nest, e.g.
+``analyze_sb_events/collect``). Because sampling happens while Polars is
+inside ``collect()``, the per-stage peaks include transient allocations
+that between-stage snapshots miss. The timeline can be written as a Chrome
+trace (open in ``chrome://tracing`` or https://ui.perfetto.dev).
+
+Readings of a worker process (e.g. one running under a memory budget) are
+fed in with ``record``; a stage that has them reports the worker's peak.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import psutil
+
+
+class MemorySampler:
+    """Sample RSS every ``interval`` seconds, tagged with the current stage."""
+
+    def __init__(self, interval: float = 0.01) -> None:
+        self.interval = interval
+        self.samples: list[tuple[float, int, str]] = []
+        self.worker_samples: list[tuple[float, int, str]] = []
+        self.spans: list[tuple[str, float, float]] = []
+        self._process = psutil.Process()
+        self._stack: list[str] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._t0 = time.perf_counter()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    @property
+    def current(self) -> str:
+        return "/".join(self._stack)
+
+    def sample(self) -> int:
+        """Record one RSS sample for the current stage and return it (bytes)."""
+        rss = self._process.memory_info().rss
+        with self._lock:
+            self.samples.append((time.perf_counter() - self._t0, rss, self.current))
+        return rss
+
+    def record(self, rss: int) -> None:
+        """Record an RSS reading (bytes) of a worker running the current stage."""
+        if not self.running:
+            return
+        with self._lock:
+            self.worker_samples.append(
+                (time.perf_counter() - self._t0, rss, self.current)
+            )
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def start(self) -> MemorySampler:
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="memory-sampler", daemon=True
+            )
+            self._thread.start()
+            self.sample()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            self.sample()
+
+    def __enter__(self) -> MemorySampler:
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Tag samples taken inside the block with ``name`` (nested under parents).
+
+        A no-op unless the sampler is running. One sample is taken on entry and
+        one on exit so even stages shorter than the interval get a reading.
+        """
+        if not self.running:
+            yield
+            return
+        with self._lock:
+            self._stack.append(name)
+            path = self.current
+        start = time.perf_counter() - self._t0
+        self.sample()
+        try:
+            yield
+        finally:
+            self.sample()
+            with self._lock:
+                self._stack.pop()
+                self.spans.append((path, start, time.perf_counter() - self._t0))
+
+    def peak_mb(self, stage: str | None = None) -> float:
+        """Peak RSS in MB overall, or within a stage and its nested stages.
+
+        Within a stage that ran in a worker, this is the worker's peak; the
+        overall peak is the largest of this process and any worker.
+        """
+        with self._lock:
+            samples = list(self.samples)
+            worker = list(self.worker_samples)
+        if stage is None:
+            samples += worker
+        else:
+            def within(s: tuple[float, int, str]) -> bool:
+                return s[2] == stage or s[2].startswith(stage + "/")
+
+            samples = [s for s in worker if within(s)] or [
+                s for s in samples if within(s)
+            ]
+        return max((rss for _, rss, _ in samples), default=0) / 1024**2
+
+    def stage_peaks(self) -> dict[str, float]:
+        """Peak RSS in MB of every stage that ran, in first-start order."""
+        spans = sorted(self.spans, key=lambda span: span[1])
+        names = dict.fromkeys(path for path, _, _ in spans)
+        return {name: self.peak_mb(name) for name in names}
+
+    def report(self, top_level_only: bool = True) -> None:
+        """Print the peak RSS and duration of each stage."""
+        durations: dict[str, float] = {}
+        for path, start, end in self.spans:
+            durations[path] = durations.get(path, 0.0) + end - start
+        print(f"{'stage':<40}{'peak RSS MB':>13}{'time s':>9}")
+        for name, peak in self.stage_peaks().items():
+            if top_level_only and "/" in name:
+                continue
+            print(f"{name:<40}{peak:>13.1f}{durations[name]:>9.2f}")
+        print(f"{'(overall)':<40}{self.peak_mb():>13.1f}")
+
+    def write_trace(self, path: Path) -> None:
+        """Write stage spans and the RSS timeline as a Chrome trace JSON file."""
+        pid = os.getpid()
+        events = [
+            {
+                "name": name.rsplit("/", 1)[-1],
+                "cat": "stage",
+                "ph": "X",
+                "ts": start * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": pid,
+                "tid": 0,
+                "args": {"stage": name, "peak_rss_mb": round(self.peak_mb(name), 1)},
+            }
+            for name, start, end in self.spans
+        ]
+        events += [
+            {
+                "name": "rss",
+                "ph": "C",
+                "ts": t * 1e6,
+                "pid": pid,
+                "args": {"rss_mb": round(rss / 1024**2, 2)},
+            }
+            for t, rss, _ in self.samples
+        ]
+        events += [
+            {
+                "name": "worker rss",
+                "ph": "C",
+                "ts": t * 1e6,
+                "pid": pid,
+                "args": {"rss_mb": round(rss / 1024**2, 2)},
+            }
+            for t, rss, _ in self.worker_samples
+        ]
+        path.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}))
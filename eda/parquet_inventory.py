@@ -0,0 +1,154 @@
+"""
+Footer-only inventory of parquet files.
+
+Reads nothing but each file's footer metadata, so it finishes in
+milliseconds regardless of file size. Per file it reports rows, row groups,
+on-disk and uncompressed size and the compression ratio; per column the
+physical type, codecs, encodings and compressed/uncompressed bytes.
+
+Usage:
+    python eda/parquet_inventory.py               # data/Polymarket + data/Statsbomb
+    python eda/parquet_inventory.py data/Statsbomb/events.parquet --columns
+    python eda/parquet_inventory.py data/Statsbomb --json inventory.json
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import polars as pl
+import pyarrow.parquet as pq
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+DEFAULT_DIRS = (DATA_DIR / "Polymarket", DATA_DIR / "Statsbomb")
+
+
+@dataclass
+class ColumnInfo:
+    name: str
+    physical_type: str
+    compression: list[str] = field(default_factory=list)
+    encodings: list[str] = field(default_factory=list)
+    compressed_bytes: int = 0
+    uncompressed_bytes: int = 0
+
+
+@dataclass
+class FileInfo:
+    path: str
+    file_bytes: int
+    rows: int
+    row_groups: int
+    created_by: str
+    columns: list[ColumnInfo]
+
+    @property
+    def compressed_bytes(self) -> int:
+        return sum(c.compressed_bytes for c in self.columns)
+
+    @property
+    def uncompressed_bytes(self) -> int:
+        return sum(c.uncompressed_bytes for c in self.columns)
+
+    @property
+    def ratio(self) -> float:
+        """Uncompressed / compressed column data size."""
+        return self.uncompressed_bytes / max(self.compressed_bytes, 1)
+
+
+def inspect_file(path: Path) -> FileInfo:
+    """Summarize one parquet file from its footer."""
+    metadata = pq.read_metadata(path)
+    columns: dict[str, ColumnInfo] = {}
+    for i in range(metadata.num_row_groups):
+        row_group = metadata.row_group(i)
+        for j in range(row_group.num_columns):
+            chunk = row_group.column(j)
+            info = columns.setdefault(
+                chunk.path_in_schema,
+                ColumnInfo(chunk.path_in_schema, chunk.physical_type),
+            )
+            if chunk.compression not in info.compression:
+                info.compression.append(chunk.compression)
+            for encoding in chunk.encodings:
+                if encoding not in info.encodings:
+                    info.encodings.append(encoding)
+            info.compressed_bytes += chunk.total_compressed_size
+            info.uncompressed_bytes += chunk.total_uncompressed_size
+    return FileInfo(
+        path=str(path),
+        file_bytes=Path(path).stat().st_size,
+        rows=metadata.num_rows,
+        row_groups=metadata.num_row_groups,
+        created_by=metadata.created_by or "",
+        columns=list(columns.values()),
+    )
+
+
+def inventory(paths: Iterable[Path] = DEFAULT_DIRS) -> list[FileInfo]:
+    """Inspect parquet files; directories are expanded to their ``*.parquet``."""
+    files = []
+    for path in map(Path, paths):
+        files += sorted(path.glob("*.parquet")) if path.is_dir() else [path]
+    return [inspect_file(path) for path in files]
+
+
+def files_frame(infos: list[FileInfo]) -> pl.DataFrame:
+    """One row per file."""
+    return pl.DataFrame(
+        [
+            {
+                "file": Path(info.path).name,
+                "rows": info.rows,
+                "row_groups": info.row_groups,
+                "size_mb": round(info.file_bytes / 1024**2, 2),
+                "uncompressed_mb": round(info.uncompressed_bytes / 1024**2, 2),
+                "ratio": round(info.ratio, 2),
+                "codecs": ",".join(
+                    sorted({codec for c in info.columns for codec in c.compression})
+                ),
+            }
+            for info in infos
+        ]
+    )
+
+
+def columns_frame(info: FileInfo) -> pl.DataFrame:
+    """One row per column of a file, largest on disk first."""
+    return pl.DataFrame(
+        [
+            {
+                "column": c.name,
+                "type": c.physical_type,
+                "codec": ",".join(c.compression),
+                "encodings": ",".join(c.encodings),
+                "size_kb": round(c.compressed_bytes / 1024, 1),
+                "uncompressed_kb": round(c.uncompressed_bytes / 1024, 1),
+                "ratio": round(c.uncompressed_bytes / max(c.compressed_bytes, 1), 2),
+            }
+            for c in info.columns
+        ]
+    ).sort("size_kb", descending=True)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inventory parquet file footers.")
+    parser.add_argument("paths", nargs="*", type=Path, default=list(DEFAULT_DIRS))
+    parser.add_argument("--columns", action="store_true", help="Per-column breakdown")
+    parser.add_argument("--json", type=Path, help="Write the full inventory as JSON")
+    args = parser.parse_args()
+
+    infos = inventory(args.paths)
+    with pl.Config(tbl_rows=-1, tbl_cols=-1, tbl_width_chars=120):
+        print(files_frame(infos))
+        if args.columns:
+            for info in infos:
+                print(f"\n{info.path}")
+                print(columns_frame(info))
+    if args.json:
+        args.json.write_text(json.dumps([asdict(info) for info in infos], indent=2))
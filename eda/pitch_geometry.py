@@ -0,0 +1,171 @@
+"""
+Vectorized pitch geometry for StatsBomb coordinates.
+
+StatsBomb locations are on a 120 x 80 pitch with every event oriented so the
+acting team attacks towards x = 120; the goal mouth spans y = 36..44. Each
+function here works on NumPy arrays *and* Polars expressions, so the same
+formula runs over a whole column, and ``register`` installs matching DuckDB
+macros. None of it needs the DuckDB spatial extension.
+
+    import polars as pl
+    from pitch_geometry import distance, angle_to_goal, pitch_zone
+
+    events.with_columns(
+        angle_to_goal(pl.col("location_x"), pl.col("location_y")).alias("angle"),
+        pitch_zone(pl.col("location_x"), pl.col("location_y")).alias("zone"),
+    )
+
+    con = register(duckdb.connect())
+    con.sql("SELECT angle_to_goal(location_x, location_y) FROM events")
+
+Usage:
+    python eda/pitch_geometry.py    # print the DuckDB macro definitions
+"""
+
+from __future__ import annotations
+
+from typing import Any, TypeVar
+
+import duckdb
+import numpy as np
+import polars as pl
+
+PITCH_LENGTH = 120.0
+PITCH_WIDTH = 80.0
+GOAL_X = PITCH_LENGTH
+GOAL_Y = PITCH_WIDTH / 2
+GOAL_WIDTH = 8.0
+LEFT_POST_Y = GOAL_Y - GOAL_WIDTH / 2
+RIGHT_POST_Y = GOAL_Y + GOAL_WIDTH / 2
+
+# Default zone grid: 6 bands along the pitch, 3 channels across it
+ZONES_X = 6
+ZONES_Y = 3
+
+T = TypeVar("T", np.ndarray, pl.Expr)
+
+
+def _sqrt(value: Any) -> Any:
+    return value.sqrt() if isinstance(value, pl.Expr) else np.sqrt(value)
+
+
+def _arctan2(y: Any, x: Any) -> Any:
+    if isinstance(y, pl.Expr) or isinstance(x, pl.Expr):
+        return pl.arctan2(y, x)
+    return np.arctan2(y, x)
+
+
+def _bin(value: Any, width: float, bins: int) -> Any:
+    """Index of the ``width``-wide bin holding ``value``, clamped to the pitch."""
+    if isinstance(value, pl.Expr):
+        return (value / width).floor().clip(0, bins - 1).cast(pl.Int32)
+    return np.clip(np.floor(np.asarray(value) / width), 0, bins - 1).astype(np.int32)
+
+
+def _where(condition: Any, then: Any, otherwise: Any) -> Any:
+    if isinstance(condition, pl.Expr):
+        return pl.when(condition).then(then).otherwise(otherwise)
+    return np.where(condition, then, otherwise)
+
+
+# ============ GEOMETRY ============
+
+
+def distance(x0: T, y0: T, x1: T, y1: T) -> T:
+    """Euclidean distance between two points."""
+    return _sqrt((x1 - x0) ** 2 + (y1 - y0) ** 2)
+
+
+def distance_to_goal(x: T, y: T) -> T:
+    """Distance from a point to the centre of the goal being attacked."""
+    return distance(x, y, GOAL_X, GOAL_Y)
+
+
+def angle_to_goal(x: T, y: T) -> T:
+    """Angle (radians) subtended by the goal mouth, as seen from the point."""
+    dx = GOAL_X - x
+    return abs(_arctan2(RIGHT_POST_Y - y, dx) - _arctan2(LEFT_POST_Y - y, dx))
+
+
+def progressive_distance(x0: T, y0: T, x1: T, y1: T) -> T:
+    """How much closer to goal a move ends than it started (negative if further)."""
+    return distance_to_goal(x0, y0) - distance_to_goal(x1, y1)
+
+
+def pitch_zone(x: T, y: T, zones_x: int = ZONES_X, zones_y: int = ZONES_Y) -> T:
+    """Zone number on a ``zones_x`` x ``zones_y`` grid.
+
+    Zones are numbered band by band from the own goal line, ``x_band *
+    zones_y + y_channel``; points off the pitch fall into the nearest zone.
+    """
+    x_band = _bin(x, PITCH_LENGTH / zones_x, zones_x)
+    y_channel = _bin(y, PITCH_WIDTH / zones_y, zones_y)
+    return x_band * zones_y + y_channel
+
+
+def normalize_direction(x: T, y: T, flip: Any) -> tuple[T, T]:
+    """Rotate points by 180 degrees where ``flip`` is true.
+
+    Use it to put locations recorded from the other team's point of view
+    (e.g. opponents in a 360 freeze frame) into the attacking team's frame.
+    """
+    return (
+        _where(flip, PITCH_LENGTH - x, x),
+        _where(flip, PITCH_WIDTH - y, y),
+    )
+
+
+# ============ DUCKDB MACROS ============
+
+MACROS = {
+    "pitch_distance": (
+        "x0, y0, x1, y1",
+        "sqrt(power(x1 - x0, 2) + power(y1 - y0, 2))",
+    ),
+    "distance_to_goal": (
+        "x, y",
+        f"sqrt(power({GOAL_X} - x, 2) + power({GOAL_Y} - y, 2))",
+    ),
+    "angle_to_goal": (
+        "x, y",
+        f"abs(atan2({RIGHT_POST_Y} - y, {GOAL_X} - x) "
+        f"- atan2({LEFT_POST_Y} - y, {GOAL_X} - x))",
+    ),
+    "progressive_distance": (
+        "x0, y0, x1, y1",
+        "distance_to_goal(x0, y0) - distance_to_goal(x1, y1)",
+    ),
+    "pitch_zone": (
+        f"x, y, zones_x := {ZONES_X}, zones_y := {ZONES_Y}",
+        f"least(greatest(floor(x / ({PITCH_LENGTH} / zones_x)), 0), zones_x - 1)"
+        f"::INTEGER * zones_y "
+        f"+ least(greatest(floor(y / ({PITCH_WIDTH} / zones_y)), 0), zones_y - 1)"
+        f"::INTEGER",
+    ),
+    "normalize_x": ("x, flip", f"CASE WHEN flip THEN {PITCH_LENGTH} - x ELSE x END"),
+    "normalize_y": ("y, flip", f"CASE WHEN flip THEN {PITCH_WIDTH} - y ELSE y END"),
+}
+
+
+def macro_sql(temporary: bool = True) -> list[str]:
+    """CREATE MACRO statements, in dependency order."""
+    kind = "TEMP MACRO" if temporary else "MACRO"
+    return [
+        f"CREATE OR REPLACE {kind} {name}({params}) AS {body}"
+        for name, (params, body) in MACROS.items()
+    ]
+
+
+def register(
+    con: duckdb.DuckDBPyConnection | None = None, temporary: bool = True
+) -> duckdb.DuckDBPyConnection:
+    """Create the macros on ``con`` (default: the module-level ``duckdb.sql``
+    connection); ``temporary=False`` stores them in the database file."""
+    con = con if con is not None else duckdb.default_connection()
+    for statement in macro_sql(temporary):
+        con.execute(statement)
+    return con
+
+
+if __name__ == "__main__":
+    print(";\n".join(macro_sql()) + ";")
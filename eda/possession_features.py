@@ -0,0 +1,349 @@
+"""
+Possession feature table for every match.
+
+A vectorized Polars port of the per-possession summary in distance.py
+(event counts, pass heights / body parts / techniques, distances and the
+start-to-end displacement), computed for all matches at once instead of a
+single hardcoded ``match_id``. Matches are split into chunks that are
+processed on a process pool, each chunk reading only its own matches from
+events.parquet, and the result is written to
+``data/derived/possessions.parquet``: one row per
+(match_id, period, possession, possession_team_id, play_pattern).
+
+Usage:
+    python eda/possession_features.py                      # all matches
+    python eda/possession_features.py --jobs 4 --chunk-size 100
+    python eda/possession_features.py --matches 15973      # one match, printed
+    python eda/possession_features.py --compare            # check vs distance.py
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import duckdb
+import polars as pl
+from feature_spec import GRAINS, CountFeature, count_exprs, feature_names
+from pitch_geometry import distance
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+EVENTS_PATH = DATA_DIR / "Statsbomb" / "events.parquet"
+OUTPUT_PATH = DATA_DIR / "derived" / "possessions.parquet"
+
+CHUNK_SIZE = 200  # matches per task
+
+# Events that carry no on-ball location for the possessing team
+EXCLUDED_TYPES = [
+    "Starting XI",
+    "Half Start",
+    "Half End",
+    "Ball Receipt*",
+    "Ball Recovery",
+]
+
+GROUP_KEYS = GRAINS["possession"]
+
+# Count features per possession (see feature_spec.py); output column names
+# follow distance.py
+TYPE_COUNTS = [
+    CountFeature(
+        "type",
+        {
+            "Carry": "carries",
+            "Pass": "passes",
+            "Pressure": "pressures",
+            "Shot": "shots",
+            "Dribble": "dribbles",
+            "Dribble Past": "dribble_pasts",
+            "Dispossessed": "dispossessions",
+            "Miscontrol": "miscontrols",
+            "Interception": "interceptions",
+        },
+    )
+]
+PASS_COUNTS = [
+    CountFeature(
+        "pass_height",
+        {
+            "High Pass": "high_passes",
+            "Ground Pass": "ground_passes",
+            "Low Pass": "low_passes",
+        },
+    ),
+    CountFeature(
+        "pass_body_part",
+        {
+            "Drop Kick": "drop_kick_passes",
+            "Head": "head_passes",
+            "Keeper Arm": "keeper_arm_passes",
+            "Left Foot": "left_foot_passes",
+            "Right Foot": "right_foot_passes",
+            "Other": "other_passes",
+        },
+    ),
+    CountFeature(
+        "pass_technique",
+        {
+            "Inswinging": "inswinging_passes",
+            "Straight": "straight_passes",
+            "Through Ball": "through_ball_passes",
+        },
+    ),
+]
+
+# Event column -> suffix of the start_/end_ attribute of each possession
+BOUNDARY_COLUMNS = {
+    "index_num": "index",
+    "minute": "minute",
+    "second": "second",
+    "location_x": "x",
+    "location_y": "y",
+    "type": "type",
+}
+
+EVENT_COLUMNS = [
+    "match_id",
+    "index_num",
+    "period",
+    "minute",
+    "second",
+    "duration",
+    "location_x",
+    "location_y",
+    "possession",
+    "possession_team_id",
+    "team_id",
+    "type",
+    "player_id",
+    "play_pattern",
+    "pass_length",
+    "pass_height",
+    "pass_body_part",
+    "pass_technique",
+]
+
+
+def _sum(expr: pl.Expr) -> pl.Expr:
+    """SQL SUM: null when every value is null, unlike Polars' 0."""
+    return pl.when(expr.is_not_null().any()).then(expr.sum())
+
+
+def possession_events(events: pl.LazyFrame) -> pl.LazyFrame:
+    """On-ball events of the possessing team with the distance to the next one.
+
+    As in distance.py, "next" is the next such event in the match, which may
+    belong to the following possession.
+    """
+    return (
+        events.select(EVENT_COLUMNS)
+        .filter(
+            ~pl.col("type").is_in(EXCLUDED_TYPES),
+            pl.col("possession_team_id") == pl.col("team_id"),
+            pl.col("location_x").is_not_null(),
+            pl.col("location_y").is_not_null(),
+        )
+        .sort("match_id", "index_num")
+        .with_columns(
+            distance(
+                pl.col("location_x"),
+                pl.col("location_y"),
+                pl.col("location_x").shift(-1).over("match_id"),
+                pl.col("location_y").shift(-1).over("match_id"),
+            ).alias("euclidean_distance")
+        )
+    )
+
+
+def possession_features(events: pl.LazyFrame) -> pl.LazyFrame:
+    """Per-possession feature table from raw events (any number of matches).
+
+    Everything, including the first/last-event attributes, comes out of a
+    single group-by: boundary values are picked with ``arg_min``/``arg_max``
+    of ``index_num`` instead of joining the events back in.
+    """
+    first = pl.col("index_num").arg_min()
+    last = pl.col("index_num").arg_max()
+    return (
+        possession_events(events)
+        .group_by(GROUP_KEYS)
+        .agg(
+            pl.col("duration").fill_null(0).sum().alias("total_possession_time"),
+            *count_exprs(TYPE_COUNTS),
+            _sum(pl.col("euclidean_distance")).alias("total_distance"),
+            pl.col("player_id").drop_nulls().n_unique().alias("possessing_players"),
+            _sum(pl.col("pass_length")).alias("pass_distance"),
+            pl.col("pass_length").is_not_null().sum().alias("pass_attempts"),
+            *count_exprs(PASS_COUNTS),
+            *[
+                pl.col(column).get(position).alias(f"{prefix}_{name}")
+                for prefix, position in (("start", first), ("end", last))
+                for column, name in BOUNDARY_COLUMNS.items()
+            ],
+        )
+        .with_columns(
+            distance(
+                pl.col("start_x"),
+                pl.col("start_y"),
+                pl.col("end_x"),
+                pl.col("end_y"),
+            ).alias("relative_distance"),
+            (
+                pl.col("end_minute") * 60
+                + pl.col("end_second")
+                - pl.col("start_minute") * 60
+                - pl.col("start_second")
+            ).alias("elapsed_seconds"),
+        )
+        .sort("match_id", "possession", "start_index")
+        .select(
+            *GROUP_KEYS,
+            "total_possession_time",
+            *feature_names(TYPE_COUNTS),
+            "total_distance",
+            "possessing_players",
+            "pass_distance",
+            "pass_attempts",
+            *feature_names(PASS_COUNTS),
+            "relative_distance",
+            *[
+                f"{prefix}_{name}"
+                for prefix in ("start", "end")
+                for name in BOUNDARY_COLUMNS.values()
+            ],
+            "elapsed_seconds",
+        )
+    )
+
+
+# ============ BATCH ENGINE ============
+
+
+def match_ids(events_path: Path = EVENTS_PATH) -> list[int]:
+    return (
+        pl.scan_parquet(events_path)
+        .select(pl.col("match_id").unique().sort())
+        .collect()["match_id"]
+        .to_list()
+    )
+
+
+def compute_chunk(events_path: Path, chunk: list[int]) -> pl.DataFrame:
+    """Possession features of the given matches, read with a pushed-down filter."""
+    events = pl.scan_parquet(events_path).filter(pl.col("match_id").is_in(chunk))
+    return possession_features(events).collect()
+
+
+def build(
+    events_path: Path = EVENTS_PATH,
+    matches: list[int] | None = None,
+    jobs: int = os.cpu_count() or 1,
+    chunk_size: int = CHUNK_SIZE,
+) -> pl.DataFrame:
+    """Possession features for ``matches`` (default: all), chunked over ``jobs``."""
+    matches = match_ids(events_path) if matches is None else sorted(matches)
+    chunks = [
+        matches[i : i + chunk_size] for i in range(0, len(matches), chunk_size)
+    ] or [[]]
+    if jobs <= 1 or len(chunks) <= 1:
+        parts = [compute_chunk(events_path, chunk) for chunk in chunks]
+    else:
+        # Split Polars' thread pool across the workers
+        previous = os.environ.get("POLARS_MAX_THREADS")
+        if previous is None:
+            threads = max(1, (os.cpu_count() or 1) // jobs)
+            os.environ["POLARS_MAX_THREADS"] = str(threads)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=min(jobs, len(chunks)),
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as pool:
+                paths = [events_path] * len(chunks)
+                parts = list(pool.map(compute_chunk, paths, chunks))
+        finally:
+            if previous is None:
+                os.environ.pop("POLARS_MAX_THREADS", None)
+    # Chunks hold disjoint matches in ascending order, so this stays sorted
+    return pl.concat(parts)
+
+
+def write(table: pl.DataFrame, output_path: Path = OUTPUT_PATH) -> Path:
+    """Write the feature table atomically."""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.tmp")
+    table.write_parquet(tmp_path, compression="zstd", statistics=True)
+    os.replace(tmp_path, output_path)
+    return output_path
+
+
+def compare(events_path: Path = EVENTS_PATH) -> None:
+    """Check the engine against distance.py's self-join query and time both."""
+    import distance
+    from polars.testing import assert_frame_equal
+
+    start = time.perf_counter()
+    table = build(events_path, jobs=1)
+    engine_s = time.perf_counter() - start
+    print(f"possession_features: {table.height:,} rows in {engine_s:.2f}s")
+
+    start = time.perf_counter()
+    try:
+        reference = distance.possession_timeline(
+            match_id=None, location=events_path.parent.parent.as_posix()
+        ).pl()
+    except duckdb.Error as e:
+        print(f"distance.py query unavailable: {e}")
+        return
+    query_s = time.perf_counter() - start
+    print(f"distance.py query:   {reference.height:,} rows in {query_s:.2f}s")
+
+    assert_frame_equal(
+        reference.sort(GROUP_KEYS),
+        table.select(reference.columns).sort(GROUP_KEYS),
+        check_dtypes=False,
+        abs_tol=1e-9,
+    )
+    print(f"Outputs match ({query_s / engine_s:.1f}x faster).")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the possession feature table.")
+    parser.add_argument("--events", type=Path, default=EVENTS_PATH)
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument(
+        "--matches", type=int, nargs="+", help="Only these matches; print, don't write"
+    )
+    parser.add_argument(
+        "--compare",
+        action="store_true",
+        help="Verify against and benchmark distance.py's query, then exit",
+    )
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(args.events)
+        return
+
+    start = time.perf_counter()
+    table = build(args.events, args.matches, args.jobs, args.chunk_size)
+    elapsed = time.perf_counter() - start
+    if args.matches:
+        with pl.Config(tbl_cols=-1):
+            print(table)
+        return
+    write(table, args.output)
+    print(
+        f"{table.height:,} possessions from {table['match_id'].n_unique():,} matches "
+        f"in {elapsed:.2f}s -> {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
-import duckdb
-duckdb.sql(f"""INSTALL spatial""")
-duckdb.sql(f"""LOAD spatial""")
\ No newline at end of file
+from pitch_geometry import register
+
+# Geometry helpers (pitch_distance, angle_to_goal, pitch_zone, ...) as DuckDB
+# macros on the default connection; replaces INSTALL/LOAD spatial
+register()
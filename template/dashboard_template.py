@@ -3,6 +3,8 @@ Soccer Analytics Dashboard Template
 Interactive Plotly Dash dashboard for visualizing StatsBomb soccer data
 """
 
+import os
+from functools import lru_cache
 from pathlib import Path
 
 import plotly.express as px
@@ -10,57 +12,64 @@ import plotly.graph_objects as go
 import polars as pl
 from dash import Dash, Input, Output, dcc, html
 
-# Data paths
-DATA_DIR = Path(__file__).parent.parent / "data"
-STATSBOMB_DIR = DATA_DIR / "Statsbomb"
+from data_store import summarize_matches
+from figure_cache import FigureCache
+from metrics import instrument, phase, register
+from snapshot import (
+    SNAPSHOT_DIR,
+    load_snapshot,
+    open_match_store,
+    source_paths,
+)
+
+# Prepared frames are memory-mapped from a versioned Arrow IPC snapshot that is
+# only rebuilt when the source parquet fingerprint changes (see snapshot.py).
+# serve.py points every worker at the same snapshot through DASHBOARD_SNAPSHOT.
+SNAPSHOT_ENV = "DASHBOARD_SNAPSHOT"
+snapshot_dir = Path(os.environ.get(SNAPSHOT_ENV, SNAPSHOT_DIR))
+
+# Dashboard data sources; a change to any of them reloads the prepared frames
+DATA_SOURCES = source_paths()
+
+
+def prepare_data():
+    """Load every frame the layout and callbacks read."""
+    global matches_df, match_summary_df, match_players_df, matches_with_results
+    global event_counts, shots_df, matches_with_goals, all_teams, match_store
+
+    frames = load_snapshot(snapshot_dir)
+    # Match-sorted events with an offset index: one match is a constant-time slice
+    match_store = open_match_store(snapshot_dir, frames["match_offsets"])
+
+    matches_df = frames["matches"]
+    match_summary_df = frames["match_summary"]
+    match_players_df = frames["match_players"]
+    matches_with_results = frames["matches_with_results"]
+    event_counts = frames["event_counts"]
+    shots_df = frames["shots"]
+    matches_with_goals = frames["matches_with_goals"]
+    all_teams = frames["all_teams"]["team"].to_list()
+
 
-# Load data
 print("Loading data...")
-matches_df = pl.read_parquet(STATSBOMB_DIR / "matches.parquet")
-events_df = pl.read_parquet(STATSBOMB_DIR / "events.parquet")
-lineups_df = pl.read_parquet(STATSBOMB_DIR / "lineups.parquet")
-
-# Prepare data
-print("Processing data...")
-
-# Match results
-matches_with_results = matches_df.with_columns(
-    pl.when(pl.col("home_score") > pl.col("away_score"))
-    .then(pl.lit("Home Win"))
-    .when(pl.col("away_score") > pl.col("home_score"))
-    .then(pl.lit("Away Win"))
-    .otherwise(pl.lit("Draw"))
-    .alias("result")
-)
+prepare_data()
 
-# Event type counts
-event_counts = (
-    events_df.group_by("type")
-    .agg(pl.len().alias("count"))
-    .sort("count", descending=True)
-    .head(15)
-)
 
-# xG data (shots only)
-shots_df = events_df.filter(
-    (pl.col("type") == "Shot") & (pl.col("shot_statsbomb_xg").is_not_null())
-)
+def reload_data():
+    """Re-derive the frames and drop cached filters after a data refresh."""
+    print("Source data changed, reloading...")
+    prepare_data()
+    resolve_match_ids.cache_clear()
 
-# Goals per match
-matches_with_goals = matches_df.with_columns(
-    (pl.col("home_score") + pl.col("away_score")).alias("total_goals")
-)
 
-# Get unique teams for filter
-all_teams = sorted(
-    set(
-        matches_df["home_team"].unique().to_list()
-        + matches_df["away_team"].unique().to_list()
-    )
-)
+# Server-side figure cache, invalidated when DATA_SOURCES change
+figure_cache = FigureCache(DATA_SOURCES, max_entries=256, on_change=reload_data)
 
 # Initialize Dash app
 app = Dash(__name__)
+server = app.server  # WSGI entry point for multi-worker serving (serve.py)
+register(server)  # per-callback latency/payload metrics at /metrics
+figure_cache.register(server)  # splice cached figure JSON into responses
 
 # Centralized THEME configuration
 THEME = {
@@ -156,443 +165,529 @@ LABEL_STYLE = {
     "fontFamily": "DM Sans, sans-serif",
 }
 
+
 # App layout
-app.layout = html.Div(
-    style={
-        "backgroundColor": THEME["colors"]["background"],
-        "padding": THEME["spacing"]["lg"],
-        "minHeight": "100vh",
-    },
-    children=[
-        # Google Fonts
-        html.Link(
-            rel="stylesheet",
-            href="https://fonts.googleapis.com/css2?family=JetBrains+Mono:wght@400;500;600;700&family=DM+Sans:wght@400;500;600;700&display=swap",
-        ),
-        html.Div(
-            style={"maxWidth": "1400px", "margin": "0 auto"},
-            children=[
-                # Header
-                html.Div(
-                    style={
-                        **CARD_STYLE,
-                        "padding": THEME["spacing"]["xl"],
-                        "marginBottom": THEME["spacing"]["xl"],
-                        "background": f"linear-gradient(135deg, {THEME['colors']['card']} 0%, {THEME['colors']['card_hover']} 100%)",
-                    },
-                    className="dashboard-header",
-                    children=[
-                        html.H1(
-                            "⚽ Soccer Analytics Dashboard",
-                            style={
-                                "color": THEME["colors"]["text"],
-                                "margin": f"0 0 {THEME['spacing']['sm']} 0",
-                                "fontSize": "36px",
-                                "fontWeight": "700",
-                                "fontFamily": "DM Sans, sans-serif",
-                            },
-                        ),
-                        html.P(
-                            "Interactive StatsBomb Data Visualization",
-                            style={
-                                "color": THEME["colors"]["text_muted"],
-                                "margin": "0",
-                                "fontSize": "16px",
-                                "fontFamily": "DM Sans, sans-serif",
-                            },
-                        ),
-                    ],
-                ),
-                # Stats Cards
-                html.Div(
-                    style={
-                        "display": "grid",
-                        "gridTemplateColumns": "repeat(auto-fit, minmax(250px, 1fr))",
-                        "gap": THEME["spacing"]["lg"],
-                        "marginBottom": THEME["spacing"]["xl"],
-                    },
-                    className="stats-grid",
-                    children=[
-                        html.Div(
-                            style={
-                                **STATS_CARD_STYLE,
-                                "borderLeft": f"4px solid {THEME['colors']['accent']}",
-                            },
-                            children=[
-                                html.Div(
-                                    "Total Matches",
-                                    style={
-                                        "color": THEME["colors"]["text_muted"],
-                                        "fontSize": "14px",
-                                        "marginBottom": THEME["spacing"]["xs"],
-                                        "fontFamily": "DM Sans, sans-serif",
-                                    },
-                                ),
-                                html.Div(
-                                    id="total-matches-stat",
-                                    style={
-                                        "color": THEME["colors"]["text"],
-                                        "fontSize": "32px",
-                                        "fontWeight": "700",
-                                        "fontFamily": "JetBrains Mono, monospace",
-                                    },
-                                    className="stats-number",
-                                ),
-                            ],
-                        ),
-                        html.Div(
-                            style={
-                                **STATS_CARD_STYLE,
-                                "borderLeft": f"4px solid {THEME['colors']['accent_secondary']}",
-                            },
-                            children=[
-                                html.Div(
-                                    "Total Events",
-                                    style={
-                                        "color": THEME["colors"]["text_muted"],
-                                        "fontSize": "14px",
-                                        "marginBottom": THEME["spacing"]["xs"],
-                                        "fontFamily": "DM Sans, sans-serif",
-                                    },
-                                ),
-                                html.Div(
-                                    id="total-events-stat",
-                                    style={
-                                        "color": THEME["colors"]["text"],
-                                        "fontSize": "32px",
-                                        "fontWeight": "700",
-                                        "fontFamily": "JetBrains Mono, monospace",
-                                    },
-                                    className="stats-number",
-                                ),
-                            ],
-                        ),
-                        html.Div(
-                            style={
-                                **STATS_CARD_STYLE,
-                                "borderLeft": f"4px solid {THEME['colors']['warning']}",
-                            },
-                            children=[
-                                html.Div(
-                                    "Unique Players",
-                                    style={
-                                        "color": THEME["colors"]["text_muted"],
-                                        "fontSize": "14px",
-                                        "marginBottom": THEME["spacing"]["xs"],
-                                        "fontFamily": "DM Sans, sans-serif",
-                                    },
-                                ),
-                                html.Div(
-                                    id="unique-players-stat",
-                                    style={
-                                        "color": THEME["colors"]["text"],
-                                        "fontSize": "32px",
-                                        "fontWeight": "700",
-                                        "fontFamily": "JetBrains Mono, monospace",
-                                    },
-                                    className="stats-number",
-                                ),
-                            ],
-                        ),
-                        html.Div(
-                            style={
-                                **STATS_CARD_STYLE,
-                                "borderLeft": f"4px solid {THEME['colors']['danger']}",
-                            },
-                            children=[
-                                html.Div(
-                                    "Avg Goals/Match",
-                                    style={
-                                        "color": THEME["colors"]["text_muted"],
-                                        "fontSize": "14px",
-                                        "marginBottom": THEME["spacing"]["xs"],
-                                        "fontFamily": "DM Sans, sans-serif",
-                                    },
-                                ),
-                                html.Div(
-                                    id="avg-goals-stat",
-                                    style={
-                                        "color": THEME["colors"]["text"],
-                                        "fontSize": "32px",
-                                        "fontWeight": "700",
-                                        "fontFamily": "JetBrains Mono, monospace",
-                                    },
-                                    className="stats-number",
-                                ),
-                            ],
-                        ),
-                    ],
-                ),
-                # Filters
-                html.Div(
-                    style={
-                        **CARD_STYLE,
-                        "marginBottom": THEME["spacing"]["xl"],
-                    },
-                    children=[
-                        html.Div(
-                            style={
-                                "display": "grid",
-                                "gridTemplateColumns": "repeat(auto-fit, minmax(250px, 1fr))",
-                                "gap": THEME["spacing"]["lg"],
-                            },
-                            className="filter-grid",
-                            children=[
-                                html.Div(
-                                    [
-                                        html.Label("Competition", style=LABEL_STYLE),
-                                        dcc.Dropdown(
-                                            id="competition-filter",
-                                            options=[
-                                                {
-                                                    "label": "All Competitions",
-                                                    "value": "all",
-                                                }
-                                            ]
-                                            + [
-                                                {"label": comp, "value": comp}
-                                                for comp in sorted(
-                                                    matches_df["competition_name"]
-                                                    .unique()
-                                                    .to_list()
-                                                )
-                                            ],
-                                            value="all",
-                                            searchable=True,
-                                            placeholder="Search or select competition...",
-                                            clearable=False,
-                                            className="custom-dropdown",
-                                        ),
-                                    ]
-                                ),
-                                html.Div(
-                                    [
-                                        html.Label("Season", style=LABEL_STYLE),
-                                        dcc.Dropdown(
-                                            id="season-filter",
-                                            options=[
-                                                {"label": "All Seasons", "value": "all"}
-                                            ]
-                                            + [
-                                                {"label": season, "value": season}
-                                                for season in sorted(
-                                                    matches_df["season_name"]
-                                                    .unique()
-                                                    .to_list()
+def serve_layout():
+    """Build the page from the current frames.
+
+    A function rather than a static tree, so every page load picks up data
+    reloaded since startup (dropdown options and the two summary charts).
+    """
+    figure_cache.check_sources()
+    return html.Div(
+        style={
+            "backgroundColor": THEME["colors"]["background"],
+            "padding": THEME["spacing"]["lg"],
+            "minHeight": "100vh",
+        },
+        children=[
+            # Google Fonts
+            html.Link(
+                rel="stylesheet",
+                href="https://fonts.googleapis.com/css2?family=JetBrains+Mono:wght@400;500;600;700&family=DM+Sans:wght@400;500;600;700&display=swap",
+            ),
+            html.Div(
+                style={"maxWidth": "1400px", "margin": "0 auto"},
+                children=[
+                    # Header
+                    html.Div(
+                        style={
+                            **CARD_STYLE,
+                            "padding": THEME["spacing"]["xl"],
+                            "marginBottom": THEME["spacing"]["xl"],
+                            "background": f"linear-gradient(135deg, {THEME['colors']['card']} 0%, {THEME['colors']['card_hover']} 100%)",
+                        },
+                        className="dashboard-header",
+                        children=[
+                            html.H1(
+                                "⚽ Soccer Analytics Dashboard",
+                                style={
+                                    "color": THEME["colors"]["text"],
+                                    "margin": f"0 0 {THEME['spacing']['sm']} 0",
+                                    "fontSize": "36px",
+                                    "fontWeight": "700",
+                                    "fontFamily": "DM Sans, sans-serif",
+                                },
+                            ),
+                            html.P(
+                                "Interactive StatsBomb Data Visualization",
+                                style={
+                                    "color": THEME["colors"]["text_muted"],
+                                    "margin": "0",
+                                    "fontSize": "16px",
+                                    "fontFamily": "DM Sans, sans-serif",
+                                },
+                            ),
+                        ],
+                    ),
+                    # Stats Cards
+                    html.Div(
+                        style={
+                            "display": "grid",
+                            "gridTemplateColumns": "repeat(auto-fit, minmax(250px, 1fr))",
+                            "gap": THEME["spacing"]["lg"],
+                            "marginBottom": THEME["spacing"]["xl"],
+                        },
+                        className="stats-grid",
+                        children=[
+                            html.Div(
+                                style={
+                                    **STATS_CARD_STYLE,
+                                    "borderLeft": f"4px solid {THEME['colors']['accent']}",
+                                },
+                                children=[
+                                    html.Div(
+                                        "Total Matches",
+                                        style={
+                                            "color": THEME["colors"]["text_muted"],
+                                            "fontSize": "14px",
+                                            "marginBottom": THEME["spacing"]["xs"],
+                                            "fontFamily": "DM Sans, sans-serif",
+                                        },
+                                    ),
+                                    html.Div(
+                                        id="total-matches-stat",
+                                        style={
+                                            "color": THEME["colors"]["text"],
+                                            "fontSize": "32px",
+                                            "fontWeight": "700",
+                                            "fontFamily": "JetBrains Mono, monospace",
+                                        },
+                                        className="stats-number",
+                                    ),
+                                ],
+                            ),
+                            html.Div(
+                                style={
+                                    **STATS_CARD_STYLE,
+                                    "borderLeft": f"4px solid {THEME['colors']['accent_secondary']}",
+                                },
+                                children=[
+                                    html.Div(
+                                        "Total Events",
+                                        style={
+                                            "color": THEME["colors"]["text_muted"],
+                                            "fontSize": "14px",
+                                            "marginBottom": THEME["spacing"]["xs"],
+                                            "fontFamily": "DM Sans, sans-serif",
+                                        },
+                                    ),
+                                    html.Div(
+                                        id="total-events-stat",
+                                        style={
+                                            "color": THEME["colors"]["text"],
+                                            "fontSize": "32px",
+                                            "fontWeight": "700",
+                                            "fontFamily": "JetBrains Mono, monospace",
+                                        },
+                                        className="stats-number",
+                                    ),
+                                ],
+                            ),
+                            html.Div(
+                                style={
+                                    **STATS_CARD_STYLE,
+                                    "borderLeft": f"4px solid {THEME['colors']['warning']}",
+                                },
+                                children=[
+                                    html.Div(
+                                        "Unique Players",
+                                        style={
+                                            "color": THEME["colors"]["text_muted"],
+                                            "fontSize": "14px",
+                                            "marginBottom": THEME["spacing"]["xs"],
+                                            "fontFamily": "DM Sans, sans-serif",
+                                        },
+                                    ),
+                                    html.Div(
+                                        id="unique-players-stat",
+                                        style={
+                                            "color": THEME["colors"]["text"],
+                                            "fontSize": "32px",
+                                            "fontWeight": "700",
+                                            "fontFamily": "JetBrains Mono, monospace",
+                                        },
+                                        className="stats-number",
+                                    ),
+                                ],
+                            ),
+                            html.Div(
+                                style={
+                                    **STATS_CARD_STYLE,
+                                    "borderLeft": f"4px solid {THEME['colors']['danger']}",
+                                },
+                                children=[
+                                    html.Div(
+                                        "Avg Goals/Match",
+                                        style={
+                                            "color": THEME["colors"]["text_muted"],
+                                            "fontSize": "14px",
+                                            "marginBottom": THEME["spacing"]["xs"],
+                                            "fontFamily": "DM Sans, sans-serif",
+                                        },
+                                    ),
+                                    html.Div(
+                                        id="avg-goals-stat",
+                                        style={
+                                            "color": THEME["colors"]["text"],
+                                            "fontSize": "32px",
+                                            "fontWeight": "700",
+                                            "fontFamily": "JetBrains Mono, monospace",
+                                        },
+                                        className="stats-number",
+                                    ),
+                                ],
+                            ),
+                        ],
+                    ),
+                    # Filters
+                    html.Div(
+                        style={
+                            **CARD_STYLE,
+                            "marginBottom": THEME["spacing"]["xl"],
+                        },
+                        children=[
+                            html.Div(
+                                style={
+                                    "display": "grid",
+                                    "gridTemplateColumns": "repeat(auto-fit, minmax(250px, 1fr))",
+                                    "gap": THEME["spacing"]["lg"],
+                                },
+                                className="filter-grid",
+                                children=[
+                                    html.Div(
+                                        [
+                                            html.Label("Competition", style=LABEL_STYLE),
+                                            dcc.Dropdown(
+                                                id="competition-filter",
+                                                options=[
+                                                    {
+                                                        "label": "All Competitions",
+                                                        "value": "all",
+                                                    }
+                                                ]
+                                                + [
+                                                    {"label": comp, "value": comp}
+                                                    for comp in sorted(
+                                                        matches_df["competition_name"]
+                                                        .unique()
+                                                        .to_list()
+                                                    )
+                                                ],
+                                                value="all",
+                                                searchable=True,
+                                                placeholder="Search or select competition...",
+                                                clearable=False,
+                                                className="custom-dropdown",
+                                            ),
+                                        ]
+                                    ),
+                                    html.Div(
+                                        [
+                                            html.Label("Season", style=LABEL_STYLE),
+                                            dcc.Dropdown(
+                                                id="season-filter",
+                                                options=[
+                                                    {"label": "All Seasons", "value": "all"}
+                                                ]
+                                                + [
+                                                    {"label": season, "value": season}
+                                                    for season in sorted(
+                                                        matches_df["season_name"]
+                                                        .unique()
+                                                        .to_list()
+                                                    )
+                                                ],
+                                                value="all",
+                                                searchable=True,
+                                                placeholder="Search or select season...",
+                                                clearable=False,
+                                                className="custom-dropdown",
+                                            ),
+                                        ]
+                                    ),
+                                    html.Div(
+                                        [
+                                            html.Label("Team", style=LABEL_STYLE),
+                                            dcc.Dropdown(
+                                                id="team-filter",
+                                                options=[
+                                                    {"label": "All Teams", "value": "all"}
+                                                ]
+                                                + [
+                                                    {"label": team, "value": team}
+                                                    for team in all_teams
+                                                ],
+                                                value="all",
+                                                searchable=True,
+                                                placeholder="Search or select team...",
+                                                clearable=False,
+                                                className="custom-dropdown",
+                                            ),
+                                        ]
+                                    ),
+                                ],
+                            )
+                        ],
+                    ),
+                    # Charts Grid
+                    html.Div(
+                        style={
+                            "display": "grid",
+                            "gridTemplateColumns": "repeat(auto-fit, minmax(500px, 1fr))",
+                            "gap": THEME["spacing"]["xl"],
+                            "marginBottom": THEME["spacing"]["xl"],
+                        },
+                        className="chart-grid",
+                        children=[
+                            # Events Distribution
+                            html.Div(
+                                style={
+                                    **CARD_STYLE,
+                                    "height": "500px",
+                                },
+                                className="dashboard-card",
+                                children=[
+                                    html.H3("Event Type Distribution", style=HEADER_STYLE),
+                                    dcc.Loading(
+                                        type="default",
+                                        color=THEME["colors"]["accent"],
+                                        children=[
+                                            dcc.Graph(
+                                                figure=px.bar(
+                                                    event_counts.to_pandas(),
+                                                    x="type",
+                                                    y="count",
+                                                    labels={
+                                                        "type": "Event Type",
+                                                        "count": "Count",
+                                                    },
+                                                    color="count",
+                                                    color_continuous_scale="Blues",
+                                                    height=400,
                                                 )
-                                            ],
-                                            value="all",
-                                            searchable=True,
-                                            placeholder="Search or select season...",
-                                            clearable=False,
-                                            className="custom-dropdown",
-                                        ),
-                                    ]
-                                ),
-                                html.Div(
-                                    [
-                                        html.Label("Team", style=LABEL_STYLE),
-                                        dcc.Dropdown(
-                                            id="team-filter",
-                                            options=[
-                                                {"label": "All Teams", "value": "all"}
-                                            ]
-                                            + [
-                                                {"label": team, "value": team}
-                                                for team in all_teams
-                                            ],
-                                            value="all",
-                                            searchable=True,
-                                            placeholder="Search or select team...",
-                                            clearable=False,
-                                            className="custom-dropdown",
-                                        ),
-                                    ]
-                                ),
-                            ],
-                        )
-                    ],
-                ),
-                # Charts Grid
-                html.Div(
-                    style={
-                        "display": "grid",
-                        "gridTemplateColumns": "repeat(auto-fit, minmax(500px, 1fr))",
-                        "gap": THEME["spacing"]["xl"],
-                        "marginBottom": THEME["spacing"]["xl"],
-                    },
-                    className="chart-grid",
-                    children=[
-                        # Events Distribution
-                        html.Div(
-                            style={
-                                **CARD_STYLE,
-                                "height": "500px",
-                            },
-                            className="dashboard-card",
-                            children=[
-                                html.H3("Event Type Distribution", style=HEADER_STYLE),
-                                dcc.Loading(
-                                    type="default",
-                                    color=THEME["colors"]["accent"],
-                                    children=[
-                                        dcc.Graph(
-                                            figure=px.bar(
-                                                event_counts.to_pandas(),
-                                                x="type",
-                                                y="count",
-                                                labels={
-                                                    "type": "Event Type",
-                                                    "count": "Count",
-                                                },
-                                                color="count",
-                                                color_continuous_scale="Blues",
-                                                height=400,
-                                            )
-                                            .update_layout(
-                                                template=plotly_template,
-                                                showlegend=False,
-                                                margin=dict(l=60, r=20, t=40, b=100),
-                                                xaxis_tickangle=-45,
-                                            )
-                                            .update_traces(
-                                                marker=dict(
-                                                    line=dict(width=0),
+                                                .update_layout(
+                                                    template=plotly_template,
+                                                    showlegend=False,
+                                                    margin=dict(l=60, r=20, t=40, b=100),
+                                                    xaxis_tickangle=-45,
                                                 )
+                                                .update_traces(
+                                                    marker=dict(
+                                                        line=dict(width=0),
+                                                    )
+                                                ),
+                                                config={"displayModeBar": False},
+                                                style={"height": "400px"},
                                             ),
-                                            config={"displayModeBar": False},
-                                            style={"height": "400px"},
-                                        ),
-                                    ],
-                                ),
-                            ],
-                        ),
-                        # Match Results
-                        html.Div(
-                            style={
-                                **CARD_STYLE,
-                                "height": "500px",
-                            },
-                            className="dashboard-card",
-                            children=[
-                                html.H3(
-                                    "Match Results Distribution", style=HEADER_STYLE
-                                ),
-                                dcc.Loading(
-                                    type="default",
-                                    color=THEME["colors"]["accent"],
-                                    children=[
-                                        dcc.Graph(
-                                            id="results-chart",
-                                            config={"displayModeBar": False},
-                                            style={"height": "400px"},
-                                        ),
-                                    ],
-                                ),
-                            ],
-                        ),
-                    ],
-                ),
-                # Second Row Charts
-                html.Div(
-                    style={
-                        "display": "grid",
-                        "gridTemplateColumns": "repeat(auto-fit, minmax(500px, 1fr))",
-                        "gap": THEME["spacing"]["xl"],
-                        "marginBottom": THEME["spacing"]["xl"],
-                    },
-                    className="chart-grid",
-                    children=[
-                        # xG Distribution
-                        html.Div(
-                            style={
-                                **CARD_STYLE,
-                                "height": "500px",
-                            },
-                            className="dashboard-card",
-                            children=[
-                                html.H3("xG Distribution (Shots)", style=HEADER_STYLE),
-                                dcc.Loading(
-                                    type="default",
-                                    color=THEME["colors"]["accent"],
-                                    children=[
-                                        dcc.Graph(
-                                            figure=px.histogram(
-                                                shots_df.to_pandas(),
-                                                x="shot_statsbomb_xg",
-                                                nbins=30,
-                                                labels={
-                                                    "shot_statsbomb_xg": "Expected Goals (xG)"
-                                                },
-                                                color_discrete_sequence=[
-                                                    THEME["colors"]["accent"]
-                                                ],
-                                                height=400,
-                                            )
-                                            .update_layout(
-                                                template=plotly_template,
-                                                showlegend=False,
-                                                margin=dict(l=60, r=20, t=40, b=70),
-                                                xaxis=dict(automargin=True),
-                                                yaxis=dict(automargin=True),
-                                            )
-                                            .update_traces(
-                                                marker=dict(
-                                                    line=dict(width=0),
+                                        ],
+                                    ),
+                                ],
+                            ),
+                            # Match Results
+                            html.Div(
+                                style={
+                                    **CARD_STYLE,
+                                    "height": "500px",
+                                },
+                                className="dashboard-card",
+                                children=[
+                                    html.H3(
+                                        "Match Results Distribution", style=HEADER_STYLE
+                                    ),
+                                    dcc.Loading(
+                                        type="default",
+                                        color=THEME["colors"]["accent"],
+                                        children=[
+                                            dcc.Graph(
+                                                id="results-chart",
+                                                config={"displayModeBar": False},
+                                                style={"height": "400px"},
+                                            ),
+                                        ],
+                                    ),
+                                ],
+                            ),
+                        ],
+                    ),
+                    # Second Row Charts
+                    html.Div(
+                        style={
+                            "display": "grid",
+                            "gridTemplateColumns": "repeat(auto-fit, minmax(500px, 1fr))",
+                            "gap": THEME["spacing"]["xl"],
+                            "marginBottom": THEME["spacing"]["xl"],
+                        },
+                        className="chart-grid",
+                        children=[
+                            # xG Distribution
+                            html.Div(
+                                style={
+                                    **CARD_STYLE,
+                                    "height": "500px",
+                                },
+                                className="dashboard-card",
+                                children=[
+                                    html.H3("xG Distribution (Shots)", style=HEADER_STYLE),
+                                    dcc.Loading(
+                                        type="default",
+                                        color=THEME["colors"]["accent"],
+                                        children=[
+                                            dcc.Graph(
+                                                figure=px.histogram(
+                                                    shots_df.to_pandas(),
+                                                    x="shot_statsbomb_xg",
+                                                    nbins=30,
+                                                    labels={
+                                                        "shot_statsbomb_xg": "Expected Goals (xG)"
+                                                    },
+                                                    color_discrete_sequence=[
+                                                        THEME["colors"]["accent"]
+                                                    ],
+                                                    height=400,
+                                                )
+                                                .update_layout(
+                                                    template=plotly_template,
+                                                    showlegend=False,
+                                                    margin=dict(l=60, r=20, t=40, b=70),
+                                                    xaxis=dict(automargin=True),
+                                                    yaxis=dict(automargin=True),
                                                 )
+                                                .update_traces(
+                                                    marker=dict(
+                                                        line=dict(width=0),
+                                                    )
+                                                ),
+                                                config={"displayModeBar": False},
+                                                style={"height": "400px"},
                                             ),
-                                            config={"displayModeBar": False},
-                                            style={"height": "400px"},
-                                        ),
-                                    ],
-                                ),
-                            ],
-                        ),
-                        # Goals by Competition
-                        html.Div(
-                            style={
-                                **CARD_STYLE,
-                                "height": "500px",
-                            },
-                            className="dashboard-card",
-                            children=[
-                                html.H3("Goals by Competition", style=HEADER_STYLE),
-                                dcc.Loading(
-                                    type="default",
-                                    color=THEME["colors"]["accent"],
-                                    children=[
-                                        dcc.Graph(
-                                            id="goals-chart",
-                                            config={"displayModeBar": False},
-                                            style={"height": "400px"},
-                                        ),
-                                    ],
-                                ),
-                            ],
-                        ),
-                    ],
-                ),
-                # Footer
-                html.Div(
-                    style={
-                        "textAlign": "center",
-                        "color": THEME["colors"]["text_muted"],
-                        "marginTop": THEME["spacing"]["xl"],
-                        "paddingTop": THEME["spacing"]["lg"],
-                        "borderTop": f"1px solid {THEME['colors']['border']}",
-                        "fontFamily": "DM Sans, sans-serif",
-                    },
-                    children=[
-                        html.P(
-                            "© 2025 Trilemma Foundation - Soccer Analytics Capstone Template",
-                            style={"margin": "0"},
-                        )
-                    ],
-                ),
-            ],
-        ),
-    ],
-)
+                                        ],
+                                    ),
+                                ],
+                            ),
+                            # Goals by Competition
+                            html.Div(
+                                style={
+                                    **CARD_STYLE,
+                                    "height": "500px",
+                                },
+                                className="dashboard-card",
+                                children=[
+                                    html.H3("Goals by Competition", style=HEADER_STYLE),
+                                    dcc.Loading(
+                                        type="default",
+                                        color=THEME["colors"]["accent"],
+                                        children=[
+                                            dcc.Graph(
+                                                id="goals-chart",
+                                                config={"displayModeBar": False},
+                                                style={"height": "400px"},
+                                            ),
+                                        ],
+                                    ),
+                                ],
+                            ),
+                        ],
+                    ),
+                    # Match Drill-Down
+                    html.Div(
+                        style={
+                            **CARD_STYLE,
+                            "marginBottom": THEME["spacing"]["xl"],
+                        },
+                        className="dashboard-card",
+                        children=[
+                            html.H3("Match Drill-Down", style=HEADER_STYLE),
+                            html.Label("Match", style=LABEL_STYLE),
+                            dcc.Dropdown(
+                                id="match-filter",
+                                searchable=True,
+                                placeholder="Search or select match...",
+                                clearable=False,
+                                className="custom-dropdown",
+                            ),
+                            html.Div(
+                                style={
+                                    "display": "grid",
+                                    "gridTemplateColumns": "repeat(auto-fit, minmax(500px, 1fr))",
+                                    "gap": THEME["spacing"]["xl"],
+                                    "marginTop": THEME["spacing"]["lg"],
+                                },
+                                className="chart-grid",
+                                children=[
+                                    dcc.Loading(
+                                        type="default",
+                                        color=THEME["colors"]["accent"],
+                                        children=[
+                                            dcc.Graph(
+                                                id="shot-map",
+                                                config={"displayModeBar": False},
+                                                style={"height": "400px"},
+                                            ),
+                                        ],
+                                    ),
+                                    dcc.Loading(
+                                        type="default",
+                                        color=THEME["colors"]["accent"],
+                                        children=[
+                                            dcc.Graph(
+                                                id="event-timeline",
+                                                config={"displayModeBar": False},
+                                                style={"height": "400px"},
+                                            ),
+                                        ],
+                                    ),
+                                ],
+                            ),
+                        ],
+                    ),
+                    # Footer
+                    html.Div(
+                        style={
+                            "textAlign": "center",
+                            "color": THEME["colors"]["text_muted"],
+                            "marginTop": THEME["spacing"]["xl"],
+                            "paddingTop": THEME["spacing"]["lg"],
+                            "borderTop": f"1px solid {THEME['colors']['border']}",
+                            "fontFamily": "DM Sans, sans-serif",
+                        },
+                        children=[
+                            html.P(
+                                "© 2025 Trilemma Foundation - Soccer Analytics Capstone Template",
+                                style={"margin": "0"},
+                            )
+                        ],
+                    ),
+                ],
+            ),
+        ],
+    )
+
+
+app.layout = serve_layout
+
+
+# Filter resolution shared by every callback: each (competition, season, team)
+# tuple is resolved to its match_ids once and kept in a bounded LRU cache
+FILTER_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=FILTER_CACHE_SIZE)
+def resolve_match_ids(competition, season, team):
+    filtered_matches = matches_df
+
+    if competition != "all":
+        filtered_matches = filtered_matches.filter(
+            pl.col("competition_name") == competition
+        )
+    if season != "all":
+        filtered_matches = filtered_matches.filter(pl.col("season_name") == season)
+    if team != "all":
+        filtered_matches = filtered_matches.filter(
+            (pl.col("home_team") == team) | (pl.col("away_team") == team)
+        )
+
+    return tuple(filtered_matches["match_id"].to_list())
 
 
 # Callbacks
@@ -609,53 +704,23 @@ app.layout = html.Div(
         Input("team-filter", "value"),
     ],
 )
+@instrument
+@figure_cache.watch
 def update_stats_cards(competition, season, team):
-    # Filter matches based on selections
-    filtered_matches = matches_df
-
-    if competition != "all":
-        filtered_matches = filtered_matches.filter(
-            pl.col("competition_name") == competition
-        )
-    if season != "all":
-        filtered_matches = filtered_matches.filter(pl.col("season_name") == season)
-    if team != "all":
-        filtered_matches = filtered_matches.filter(
-            (pl.col("home_team") == team) | (pl.col("away_team") == team)
-        )
-
-    # Total Matches
-    total_matches = len(filtered_matches)
-    matches_text = f"{total_matches:,}"
-
-    # Total Events (filter events by match_ids)
-    if total_matches > 0:
-        filtered_match_ids = filtered_matches["match_id"].to_list()
-        filtered_events = events_df.filter(pl.col("match_id").is_in(filtered_match_ids))
-        total_events = len(filtered_events)
-        events_text = f"{total_events:,}"
+    with phase("filter"):
+        match_ids = resolve_match_ids(competition, season, team)
+
+    # All four cards are answered from the precomputed per-match summary
+    with phase("aggregate"):
+        totals = summarize_matches(match_summary_df, match_players_df, match_ids)
+    matches_text = f"{totals['matches']:,}"
+    if totals["matches"] > 0:
+        events_text = f"{totals['events']:,}"
+        players_text = f"{totals['players']:,}"
+        goals_text = f"{totals['avg_goals']:.2f}"
     else:
         events_text = "0"
-
-    # Unique Players (filter lineups by match_ids)
-    if total_matches > 0:
-        filtered_match_ids = filtered_matches["match_id"].to_list()
-        filtered_lineups = lineups_df.filter(
-            pl.col("match_id").is_in(filtered_match_ids)
-        )
-        unique_players = filtered_lineups["player_name"].n_unique()
-        players_text = f"{unique_players:,}"
-    else:
         players_text = "0"
-
-    # Avg Goals/Match
-    if total_matches > 0:
-        filtered_matches_with_goals = filtered_matches.with_columns(
-            (pl.col("home_score") + pl.col("away_score")).alias("total_goals")
-        )
-        avg_goals = filtered_matches_with_goals["total_goals"].mean()
-        goals_text = f"{avg_goals:.2f}"
-    else:
         goals_text = "0.00"
 
     return matches_text, events_text, players_text, goals_text
@@ -669,45 +734,45 @@ def update_stats_cards(competition, season, team):
         Input("team-filter", "value"),
     ],
 )
+@instrument
+@figure_cache.cached
 def update_results_chart(competition, season, team):
-    filtered_df = matches_with_results
-
-    if competition != "all":
-        filtered_df = filtered_df.filter(pl.col("competition_name") == competition)
-    if season != "all":
-        filtered_df = filtered_df.filter(pl.col("season_name") == season)
-    if team != "all":
-        filtered_df = filtered_df.filter(
-            (pl.col("home_team") == team) | (pl.col("away_team") == team)
+    with phase("filter"):
+        match_ids = resolve_match_ids(competition, season, team)
+        filtered_df = matches_with_results.filter(pl.col("match_id").is_in(match_ids))
+
+    with phase("aggregate"):
+        result_counts = filtered_df.group_by("result").agg(pl.len().alias("count"))
+
+    with phase("to_pandas"):
+        pdf = result_counts.to_pandas()
+
+    with phase("figure"):
+        fig = px.pie(
+            pdf,
+            values="count",
+            names="result",
+            color="result",
+            color_discrete_map={
+                "Home Win": THEME["colors"]["success"],
+                "Away Win": THEME["colors"]["danger"],
+                "Draw": THEME["colors"]["warning"],
+            },
+            height=400,
         )
 
-    result_counts = filtered_df.group_by("result").agg(pl.len().alias("count"))
-
-    fig = px.pie(
-        result_counts.to_pandas(),
-        values="count",
-        names="result",
-        color="result",
-        color_discrete_map={
-            "Home Win": THEME["colors"]["success"],
-            "Away Win": THEME["colors"]["danger"],
-            "Draw": THEME["colors"]["warning"],
-        },
-        height=400,
-    )
-
-    fig.update_layout(
-        template=plotly_template,
-        showlegend=True,
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=-0.1,
-            xanchor="center",
-            x=0.5,
-        ),
-        margin=dict(l=20, r=20, t=40, b=20),
-    )
+        fig.update_layout(
+            template=plotly_template,
+            showlegend=True,
+            legend=dict(
+                orientation="h",
+                yanchor="bottom",
+                y=-0.1,
+                xanchor="center",
+                x=0.5,
+            ),
+            margin=dict(l=20, r=20, t=40, b=20),
+        )
 
     return fig
 
@@ -720,47 +785,166 @@ def update_results_chart(competition, season, team):
         Input("team-filter", "value"),
     ],
 )
+@instrument
+@figure_cache.cached
 def update_goals_chart(competition, season, team):
-    filtered_df = matches_with_goals
+    with phase("filter"):
+        match_ids = resolve_match_ids(competition, season, team)
+        filtered_df = matches_with_goals.filter(pl.col("match_id").is_in(match_ids))
+
+    with phase("aggregate"):
+        goals_by_comp = (
+            filtered_df.group_by("competition_name")
+            .agg(pl.col("total_goals").mean().alias("avg_goals"))
+            .sort("avg_goals", descending=True)
+        )
 
-    if competition != "all":
-        filtered_df = filtered_df.filter(pl.col("competition_name") == competition)
-    if season != "all":
-        filtered_df = filtered_df.filter(pl.col("season_name") == season)
-    if team != "all":
-        filtered_df = filtered_df.filter(
-            (pl.col("home_team") == team) | (pl.col("away_team") == team)
+    with phase("to_pandas"):
+        pdf = goals_by_comp.to_pandas()
+
+    with phase("figure"):
+        fig = px.bar(
+            pdf,
+            x="competition_name",
+            y="avg_goals",
+            labels={
+                "competition_name": "Competition",
+                "avg_goals": "Average Goals per Match",
+            },
+            color="avg_goals",
+            color_continuous_scale="Viridis",
+            height=400,
         )
 
-    goals_by_comp = (
-        filtered_df.group_by("competition_name")
-        .agg(pl.col("total_goals").mean().alias("avg_goals"))
-        .sort("avg_goals", descending=True)
-    )
+        fig.update_layout(
+            template=plotly_template,
+            showlegend=False,
+            margin=dict(l=60, r=80, t=40, b=180),
+            xaxis_tickangle=-45,
+            xaxis=dict(
+                tickmode='linear',
+                automargin=True,
+            ),
+        )
 
-    fig = px.bar(
-        goals_by_comp.to_pandas(),
-        x="competition_name",
-        y="avg_goals",
-        labels={
-            "competition_name": "Competition",
-            "avg_goals": "Average Goals per Match",
-        },
-        color="avg_goals",
-        color_continuous_scale="Viridis",
-        height=400,
-    )
+    return fig
 
-    fig.update_layout(
-        template=plotly_template,
-        showlegend=False,
-        margin=dict(l=60, r=80, t=40, b=180),
-        xaxis_tickangle=-45,
-        xaxis=dict(
-            tickmode='linear',
-            automargin=True,
-        ),
-    )
+
+@app.callback(
+    [Output("match-filter", "options"), Output("match-filter", "value")],
+    [
+        Input("competition-filter", "value"),
+        Input("season-filter", "value"),
+        Input("team-filter", "value"),
+    ],
+)
+@instrument
+@figure_cache.watch
+def update_match_options(competition, season, team):
+    with phase("filter"):
+        match_ids = resolve_match_ids(competition, season, team)
+        filtered_df = matches_df.filter(pl.col("match_id").is_in(match_ids)).sort(
+            "match_date", descending=True
+        )
+
+    options = [
+        {
+            "label": f"{row['match_date']}  {row['home_team']} "
+            f"{row['home_score']}-{row['away_score']} {row['away_team']}",
+            "value": row["match_id"],
+        }
+        for row in filtered_df.iter_rows(named=True)
+    ]
+    return options, options[0]["value"] if options else None
+
+
+@app.callback(
+    Output("shot-map", "figure"),
+    Input("match-filter", "value"),
+)
+@instrument
+@figure_cache.cached
+def update_shot_map(match_id):
+    with phase("filter"):
+        shots = match_store.events(match_id).filter(pl.col("type") == "Shot")
+
+    with phase("to_pandas"):
+        pdf = shots.to_pandas()
+
+    with phase("figure"):
+        fig = px.scatter(
+            pdf,
+            x="location_x",
+            y="location_y",
+            color="team",
+            size=pdf["shot_statsbomb_xg"].fillna(0.01) if len(pdf) else None,
+            hover_data=["player", "minute", "shot_statsbomb_xg"],
+            labels={"location_x": "", "location_y": "", "team": "Team"},
+            title="Shot Map (size = xG)",
+            height=400,
+        )
+
+        # StatsBomb pitch: 120 x 80, y grows downwards
+        pitch_line = dict(color=THEME["colors"]["grid"])
+        fig.add_shape(type="rect", x0=0, y0=0, x1=120, y1=80, line=pitch_line)
+        fig.add_shape(type="line", x0=60, y0=0, x1=60, y1=80, line=pitch_line)
+        for x0, x1 in ((0, 18), (102, 120)):
+            fig.add_shape(type="rect", x0=x0, y0=18, x1=x1, y1=62, line=pitch_line)
+
+        fig.update_layout(
+            template=plotly_template,
+            margin=dict(l=20, r=20, t=40, b=20),
+            xaxis=dict(range=[-2, 122], showgrid=False, showticklabels=False),
+            yaxis=dict(
+                range=[82, -2], showgrid=False, showticklabels=False, scaleanchor="x"
+            ),
+            legend=dict(
+                orientation="h", yanchor="bottom", y=-0.1, xanchor="center", x=0.5
+            ),
+        )
+
+    return fig
+
+
+@app.callback(
+    Output("event-timeline", "figure"),
+    Input("match-filter", "value"),
+)
+@instrument
+@figure_cache.cached
+def update_event_timeline(match_id):
+    with phase("filter"):
+        events = match_store.events(match_id)
+
+    with phase("aggregate"):
+        per_minute = (
+            events.drop_nulls("team")
+            .group_by(["minute", "team"])
+            .agg(pl.len().alias("events"))
+            .sort("minute")
+        )
+
+    with phase("to_pandas"):
+        pdf = per_minute.to_pandas()
+
+    with phase("figure"):
+        fig = px.line(
+            pdf,
+            x="minute",
+            y="events",
+            color="team",
+            labels={"minute": "Minute", "events": "Events", "team": "Team"},
+            title="Event Timeline",
+            height=400,
+        )
+
+        fig.update_layout(
+            template=plotly_template,
+            margin=dict(l=60, r=20, t=40, b=60),
+            legend=dict(
+                orientation="h", yanchor="bottom", y=-0.3, xanchor="center", x=0.5
+            ),
+        )
 
     return fig
 
@@ -0,0 +1,375 @@
+"""
+Lazy data layer for the dashboard.
+
+Built on ``pl.scan_parquet`` so the snapshot build (see snapshot.py) only
+materializes the columns and match_id ranges it actually needs instead of
+holding full tables in memory.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+
+import polars as pl
+
+# Data paths
+DATA_DIR = Path(__file__).parent.parent / "data"
+STATSBOMB_DIR = DATA_DIR / "Statsbomb"
+DERIVED_DIR = DATA_DIR / "derived"
+MATCH_SUMMARY_PATH = DERIVED_DIR / "match_summary.parquet"
+MATCH_PLAYERS_PATH = DERIVED_DIR / "match_players.parquet"
+MATCH_SUMMARY_SOURCES = ("matches", "events", "lineups")
+
+
+def table_path(name: str) -> Path:
+    """Return the parquet path for a StatsBomb table (e.g. ``"events"``)."""
+    return STATSBOMB_DIR / f"{name}.parquet"
+
+
+def scan_table(name: str) -> pl.LazyFrame:
+    """Lazily scan a StatsBomb table without reading any rows."""
+    return pl.scan_parquet(table_path(name))
+
+
+def filter_match_ids(lf: pl.LazyFrame, match_ids: Iterable[int]) -> pl.LazyFrame:
+    """Restrict a LazyFrame to the given match_ids.
+
+    The min/max range predicate lets the parquet reader skip row groups from
+    their statistics; the ``is_in`` predicate then keeps the exact set.
+    """
+    ids = sorted(set(match_ids))
+    if not ids:
+        return lf.filter(pl.lit(False))
+    return lf.filter(
+        pl.col("match_id").is_between(ids[0], ids[-1])
+        & pl.col("match_id").is_in(ids)
+    )
+
+
+def load_table(
+    name: str,
+    columns: Sequence[str] | None = None,
+    match_ids: Iterable[int] | None = None,
+) -> pl.DataFrame:
+    """Materialize only the requested columns (and matches) of a table."""
+    lf = scan_table(name)
+    if match_ids is not None:
+        lf = filter_match_ids(lf, match_ids)
+    if columns is not None:
+        lf = lf.select(columns)
+    return lf.collect()
+
+
+def aggregate_for_matches(
+    name: str, exprs: Sequence[pl.Expr], match_ids: Iterable[int] | None = None
+) -> pl.DataFrame:
+    """Evaluate aggregate expressions over a table, pushed down into the scan."""
+    lf = scan_table(name)
+    if match_ids is not None:
+        lf = filter_match_ids(lf, match_ids)
+    return lf.select(exprs).collect()
+
+
+# ============ PER-MATCH SUMMARY ============
+
+
+def build_match_summary() -> pl.DataFrame:
+    """Build the compact per-match summary used by the stats cards.
+
+    One row per match with its event count and total goals, computed in a
+    single pass over each raw table. The lineup players of each match are
+    written alongside as a flat (match_id, player_name) table, see
+    ``load_match_players``.
+    """
+    event_counts = (
+        scan_table("events").group_by("match_id").agg(pl.len().alias("event_count"))
+    )
+    summary = (
+        scan_table("matches")
+        .select(
+            "match_id",
+            (pl.col("home_score") + pl.col("away_score")).alias("total_goals"),
+        )
+        .join(event_counts, on="match_id", how="left")
+        .with_columns(pl.col("event_count").fill_null(0).cast(pl.UInt32))
+        .sort("match_id")
+        .collect()
+    )
+    # Already "exploded", so a filter is an is_in over rows rather than
+    # exploding per-match lists on every request
+    players = (
+        scan_table("lineups")
+        .select(["match_id", "player_name"])
+        .drop_nulls("player_name")
+        .unique()
+        .sort("match_id", "player_name")
+        .collect()
+    )
+    DERIVED_DIR.mkdir(parents=True, exist_ok=True)
+    players.write_parquet(MATCH_PLAYERS_PATH)
+    summary.write_parquet(MATCH_SUMMARY_PATH)
+    return summary
+
+
+def _summary_is_stale() -> bool:
+    if not (MATCH_SUMMARY_PATH.exists() and MATCH_PLAYERS_PATH.exists()):
+        return True
+    built = min(MATCH_SUMMARY_PATH.stat().st_mtime, MATCH_PLAYERS_PATH.stat().st_mtime)
+    return any(
+        table_path(name).stat().st_mtime > built for name in MATCH_SUMMARY_SOURCES
+    )
+
+
+def load_match_summary() -> pl.DataFrame:
+    """Load the per-match summary, rebuilding it if any source table is newer."""
+    if _summary_is_stale():
+        return build_match_summary()
+    return pl.read_parquet(MATCH_SUMMARY_PATH)
+
+
+def load_match_players() -> pl.DataFrame:
+    """Load the (match_id, player_name) lineup table built with the summary."""
+    if _summary_is_stale():
+        build_match_summary()
+    return pl.read_parquet(MATCH_PLAYERS_PATH)
+
+
+def summarize_matches(
+    summary: pl.DataFrame, players: pl.DataFrame, match_ids: Iterable[int]
+) -> dict:
+    """Answer the stats-card totals for a set of matches from the summary."""
+    ids = list(match_ids)
+    totals = summary.filter(pl.col("match_id").is_in(ids)).select(
+        pl.len().alias("matches"),
+        pl.col("event_count").sum().alias("events"),
+        pl.col("total_goals").mean().alias("avg_goals"),
+    )
+    names = players["player_name"].filter(players["match_id"].is_in(ids))
+    return {**totals.row(0, named=True), "players": names.n_unique()}
+
+
+# ============ ENCODED EVENT STORE ============
+
+# Low-cardinality string columns held as dictionary-encoded categoricals
+CATEGORICAL_COLUMNS = (
+    "type",
+    "play_pattern",
+    "pass_outcome",
+    "pass_height",
+    "pass_body_part",
+    "pass_technique",
+    "possession_team",
+)
+
+# Name columns replaced by integer IDs keyed through reference.parquet
+ID_COLUMNS = {"team": "team_id", "player": "player_id"}
+
+NARROW_DTYPES = {
+    "match_id": pl.Int32,
+    "index_num": pl.UInt32,
+    "period": pl.UInt8,
+    "minute": pl.UInt8,
+    "second": pl.UInt8,
+    "possession": pl.UInt16,
+    "team_id": pl.Int32,
+    "player_id": pl.Int32,
+    "position_id": pl.Int32,
+    "possession_team_id": pl.Int32,
+    "duration": pl.Float32,
+    "location_x": pl.Float32,
+    "location_y": pl.Float32,
+    "shot_statsbomb_xg": pl.Float32,
+    "pass_length": pl.Float32,
+}
+
+
+def reference_ids(table_name: str) -> pl.LazyFrame:
+    """Return the ``id``/``name`` lookup for one entity type in reference.parquet.
+
+    Keyed on ``id``: names are display labels only, and different players
+    can share one.
+    """
+    return (
+        scan_table("reference")
+        .filter(pl.col("table_name") == table_name)
+        .select(pl.col("id").cast(pl.Int32), "name")
+        .unique(subset="id", keep="first")
+    )
+
+
+def _name_to_id(table_name: str) -> pl.LazyFrame:
+    """``reference_ids`` for a join on ``name``; raises if a name is ambiguous."""
+    lookup = reference_ids(table_name).collect()
+    ambiguous = (
+        lookup.group_by("name")
+        .agg(pl.col("id").n_unique().alias("ids"))
+        .filter(pl.col("ids") > 1)
+        .sort("name")
+    )
+    if not ambiguous.is_empty():
+        examples = ", ".join(repr(name) for name in ambiguous["name"].head(5))
+        raise ValueError(
+            f"{len(ambiguous):,} {table_name} names in reference.parquet map to "
+            f"several ids (e.g. {examples}); events need a "
+            f"{ID_COLUMNS[table_name]} column to be encoded"
+        )
+    return lookup.lazy()
+
+
+def encode_events(lf: pl.LazyFrame) -> pl.LazyFrame:
+    """Convert an events LazyFrame to its compact in-memory representation.
+
+    Team and player names become Int32 IDs (taken from the events' own
+    ``*_id`` columns when present, otherwise looked up by name in
+    reference.parquet, which fails if a name belongs to several IDs),
+    low-cardinality strings become categoricals and numeric columns are
+    narrowed. Names can be recovered with :func:`reference_ids`.
+    """
+    schema = lf.collect_schema()
+    for name_col, id_col in ID_COLUMNS.items():
+        if name_col not in schema:
+            continue
+        if id_col not in schema:
+            lookup = _name_to_id(name_col).rename({"id": id_col, "name": name_col})
+            lf = lf.join(lookup, on=name_col, how="left", maintain_order="left")
+        lf = lf.drop(name_col)
+    schema = lf.collect_schema()
+    return lf.with_columns(
+        [pl.col(c).cast(pl.Categorical) for c in CATEGORICAL_COLUMNS if c in schema]
+        + [pl.col(c).cast(dtype) for c, dtype in NARROW_DTYPES.items() if c in schema]
+    )
+
+
+def load_encoded_events(
+    columns: Sequence[str] | None = None, match_ids: Iterable[int] | None = None
+) -> pl.DataFrame:
+    """Materialize the events table (or a projection of it) in encoded form."""
+    lf = scan_table("events")
+    if match_ids is not None:
+        lf = filter_match_ids(lf, match_ids)
+    lf = encode_events(lf)
+    if columns is not None:
+        lf = lf.select(columns)
+    return lf.collect()
+
+
+def memory_report() -> pl.DataFrame:
+    """Measure the in-memory size of events before and after encoding."""
+    raw = load_table("events")
+    encoded = encode_events(raw.lazy()).collect()
+    rows = []
+    for col in raw.columns:
+        # Name columns are dropped; their ID column is reported on its own row
+        kept = encoded[col] if col in encoded.columns else None
+        rows.append(
+            {
+                "column": col,
+                "before_mb": raw[col].estimated_size("mb"),
+                "after_mb": kept.estimated_size("mb") if kept is not None else 0.0,
+                "encoded_dtype": str(kept.dtype) if kept is not None else "dropped",
+            }
+        )
+    for col in encoded.columns:
+        if col not in raw.columns:
+            rows.append(
+                {
+                    "column": col,
+                    "before_mb": 0.0,
+                    "after_mb": encoded[col].estimated_size("mb"),
+                    "encoded_dtype": str(encoded[col].dtype),
+                }
+            )
+    report = pl.DataFrame(rows)
+    total_before = raw.estimated_size("mb")
+    total_after = encoded.estimated_size("mb")
+    with pl.Config(tbl_rows=len(report)):
+        print(report)
+    print(
+        f"Events: {len(raw):,} rows | before: {total_before:.1f} MB | "
+        f"after: {total_after:.1f} MB | {total_before / total_after:.1f}x smaller"
+    )
+    return report
+
+
+# ============ PREPARED DASHBOARD FRAMES ============
+
+
+def prepare_frames() -> dict[str, pl.DataFrame]:
+    """Derive every frame the dashboard layout and callbacks read."""
+    matches = load_table("matches")
+
+    # Match results
+    matches_with_results = matches.with_columns(
+        pl.when(pl.col("home_score") > pl.col("away_score"))
+        .then(pl.lit("Home Win"))
+        .when(pl.col("away_score") > pl.col("home_score"))
+        .then(pl.lit("Away Win"))
+        .otherwise(pl.lit("Draw"))
+        .alias("result")
+    )
+
+    # Event type counts (grouped on the categorical codes of the encoded store)
+    event_counts = (
+        load_encoded_events(["type"])
+        .group_by("type")
+        .agg(pl.len().alias("count"))
+        .sort("count", descending=True)
+        .head(15)
+        .with_columns(pl.col("type").cast(pl.String))
+    )
+
+    # xG data (shots only)
+    shots = (
+        scan_table("events")
+        .filter(
+            (pl.col("type") == "Shot") & (pl.col("shot_statsbomb_xg").is_not_null())
+        )
+        .select("shot_statsbomb_xg")
+        .collect()
+    )
+
+    # Goals per match
+    matches_with_goals = matches.with_columns(
+        (pl.col("home_score") + pl.col("away_score")).alias("total_goals")
+    )
+
+    # Unique teams for the filter
+    all_teams = (
+        pl.concat([matches["home_team"], matches["away_team"]])
+        .unique()
+        .sort()
+        .to_frame("team")
+    )
+
+    return {
+        "matches": matches,
+        "match_summary": load_match_summary(),
+        "match_players": load_match_players(),
+        "matches_with_results": matches_with_results,
+        "event_counts": event_counts,
+        "shots": shots,
+        "matches_with_goals": matches_with_goals,
+        "all_teams": all_teams,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build dashboard data artifacts.")
+    parser.add_argument(
+        "--memory-report",
+        action="store_true",
+        help="Print the events memory footprint before/after encoding",
+    )
+    args = parser.parse_args()
+
+    if args.memory_report:
+        memory_report()
+    else:
+        summary = build_match_summary()
+        print(
+            f"Wrote {len(summary):,} match summaries to {MATCH_SUMMARY_PATH} "
+            f"and their lineups to {MATCH_PLAYERS_PATH}"
+        )
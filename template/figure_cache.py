@@ -0,0 +1,179 @@
+"""
+Server-side cache of serialized Plotly figures for the dashboard.
+
+Entries are keyed by callback name and filter tuple and hold the figure's
+encoded JSON. They are evicted least-recently used once the cache is full,
+and dropped wholesale once the data has been reloaded after the
+fingerprint (size + mtime) of the underlying parquet files changed.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import threading
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any
+
+import plotly.io as pio
+from flask import has_request_context
+
+from metrics import phase
+
+_local = threading.local()
+
+
+def fingerprint(paths: Iterable[Path]) -> tuple:
+    """Cheap data fingerprint: (name, size, mtime_ns) for each source file."""
+    fp = []
+    for path in paths:
+        stat = path.stat()
+        fp.append((path.name, stat.st_size, stat.st_mtime_ns))
+    return tuple(fp)
+
+
+class FigureCache:
+    """Size-bounded LRU of encoded figures, invalidated by a data fingerprint.
+
+    Each reload of the data bumps a generation counter; a figure computed
+    under an older generation is not stored, so a callback that raced a
+    reload cannot put a figure built from the old frames back in.
+    """
+
+    def __init__(
+        self,
+        sources: Iterable[Path],
+        max_entries: int = 256,
+        on_change: Callable[[], None] | None = None,
+    ) -> None:
+        self.sources = list(sources)
+        self.max_entries = max_entries
+        self.on_change = on_change
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+        self._entries: OrderedDict[tuple, str] = OrderedDict()
+        self._lock = threading.Lock()
+        # Serializes reloads so concurrent callbacks run on_change only once
+        self._reload_lock = threading.Lock()
+        self._fingerprint = fingerprint(self.sources)
+        self._registered = False
+
+    def check_sources(self) -> None:
+        """Reload (via ``on_change``) and drop every entry if the sources changed.
+
+        The new fingerprint is only recorded after ``on_change`` succeeds, so
+        a failed reload is retried by the next callback.
+        """
+        current = fingerprint(self.sources)
+        if current == self._fingerprint:
+            return
+        with self._reload_lock:
+            if current == self._fingerprint:
+                return  # another thread reloaded while we waited
+            if self.on_change is not None:
+                self.on_change()
+            with self._lock:
+                self._fingerprint = current
+                self.generation += 1
+                self._entries.clear()
+
+    def get(self, key: tuple) -> str | None:
+        with self._lock:
+            encoded = self._entries.get(key)
+            if encoded is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return encoded
+
+    def put(self, key: tuple, encoded: str, generation: int | None = None) -> None:
+        """Store an encoded figure unless it was built under an older generation."""
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = encoded
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def info(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "generation": self.generation,
+            }
+
+    def watch(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Decorate an uncached callback so it still triggers the source check."""
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            self.check_sources()
+            return func(*args)
+
+        return wrapper
+
+    def cached(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Decorate a figure callback so repeated filter tuples skip the rebuild.
+
+        The figure is encoded to JSON once and kept as a string. Inside a
+        request of a server set up with :meth:`register`, the callback returns
+        a short placeholder that is swapped for the encoded figure in the
+        response body, so a hit costs no serialization at all; elsewhere the
+        JSON is parsed back into a dict.
+        """
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            self.check_sources()
+            key = (func.__name__, *args)
+            encoded = self.get(key)
+            if encoded is None:
+                generation = self.generation
+                fig = func(*args)
+                with phase("serialize"):
+                    encoded = pio.to_json(fig, validate=False)
+                self.put(key, encoded, generation)
+            if self._registered and has_request_context():
+                token = f"figure-cache:{uuid.uuid4().hex}"
+                pending = getattr(_local, "splices", None)
+                if pending is None:
+                    pending = _local.splices = {}
+                pending[json.dumps(token)] = encoded
+                return token
+            return json.loads(encoded)
+
+        return wrapper
+
+    def register(self, server) -> None:
+        """Splice cached figures into Dash responses on a Flask ``server``.
+
+        Register this after :func:`metrics.register`: Flask runs
+        ``after_request`` hooks in reverse order, so the recorded payload size
+        is that of the final response.
+        """
+
+        @server.after_request
+        def _splice_figures(response):
+            pending = getattr(_local, "splices", None)
+            if pending:
+                _local.splices = None
+                body = response.get_data(as_text=True)
+                for placeholder, encoded in pending.items():
+                    body = body.replace(placeholder, encoded, 1)
+                response.set_data(body)
+            return response
+
+        self._registered = True
@@ -0,0 +1,251 @@
+"""
+Replayable load test for the dashboard callbacks.
+
+Drives every registered Dash callback headlessly through the Flask test client
+(or a running server with ``--url``), replaying a seeded, realistic mix of
+competition/season/team selections at a configurable concurrency, and reports
+throughput and latency percentiles overall and per callback. Any failed
+request (an exception or a non-2xx response) makes the run exit with status 1.
+
+Usage:
+    python template/loadtest.py --requests 500 --concurrency 8
+    python template/loadtest.py --record mix.jsonl --requests 1000
+    python template/loadtest.py --replay mix.jsonl --json results.json
+    python template/loadtest.py --max-p95-ms 250   # exit 1 if p95 is slower
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from metrics import percentile
+
+FILTER_IDS = ("competition-filter", "season-filter", "team-filter")
+MATCH_ID = "match-filter"
+
+
+def build_selections(matches, n: int, seed: int) -> list[dict[str, str]]:
+    """Generate a realistic selection mix from the matches table.
+
+    Roughly a quarter of requests are the default "all" view; the rest pick a
+    competition, then often a season it was played in and sometimes a team.
+    Every selection also opens one match in the drill-down view.
+    """
+    rng = random.Random(seed)
+    rows = matches.select(
+        ["match_id", "competition_name", "season_name", "home_team", "away_team"]
+    ).rows()
+    selections = []
+    for _ in range(n):
+        match_id, competition, season, home, away = rng.choice(rows)
+        if rng.random() < 0.25:
+            selections.append({**dict.fromkeys(FILTER_IDS, "all"), MATCH_ID: match_id})
+            continue
+        team = rng.choice([home, away])
+        selections.append(
+            {
+                "competition-filter": competition,
+                "season-filter": season if rng.random() < 0.6 else "all",
+                "team-filter": team if rng.random() < 0.3 else "all",
+                MATCH_ID: match_id,
+            }
+        )
+    return selections
+
+
+def callback_payloads(app, selection: dict[str, str]) -> list[tuple[str, dict]]:
+    """Build the ``/_dash-update-component`` request body of every callback."""
+    payloads = []
+    for output, spec in app.callback_map.items():
+        inputs = [
+            {**inp, "value": selection.get(inp["id"], "all")} for inp in spec["inputs"]
+        ]
+        if output.startswith(".."):
+            outputs = [
+                dict(zip(("id", "property"), out.split(".", 1)))
+                for out in output.strip(".").split("...")
+            ]
+        else:
+            outputs = dict(zip(("id", "property"), output.split(".", 1)))
+        body = {
+            "output": output,
+            "outputs": outputs,
+            "inputs": inputs,
+            "changedPropIds": [f"{inp['id']}.{inp['property']}" for inp in inputs],
+            "state": spec.get("state", []),
+        }
+        name = getattr(spec.get("callback"), "__name__", output)
+        payloads.append((name, body))
+    return payloads
+
+
+class Client:
+    """One thread's HTTP client: Flask test client or urllib against ``url``."""
+
+    def __init__(self, app, url: str | None) -> None:
+        self.url = url.rstrip("/") if url else None
+        self.test_client = None if url else app.server.test_client()
+
+    def post(self, body: dict) -> tuple[int, int]:
+        data = json.dumps(body).encode()
+        if self.test_client is not None:
+            response = self.test_client.post(
+                "/_dash-update-component",
+                data=data,
+                content_type="application/json",
+            )
+            return response.status_code, len(response.data)
+        request = urllib.request.Request(
+            f"{self.url}/_dash-update-component",
+            data=data,
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status, len(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, len(e.read())
+
+
+def run(app, selections, concurrency: int, url: str | None) -> dict[str, Any]:
+    """Replay the selections and return raw per-request samples."""
+    local = threading.local()
+    samples: list[dict[str, Any]] = []
+    lock = threading.Lock()
+
+    def one(selection):
+        if not hasattr(local, "client"):
+            local.client = Client(app, url)
+        for name, body in callback_payloads(app, selection):
+            start = time.perf_counter()
+            error = None
+            try:
+                status, size = local.client.post(body)
+            except Exception as e:
+                status, size = -1, 0
+                error = type(e).__name__
+            ms = (time.perf_counter() - start) * 1000
+            if error is None and not 200 <= status < 300:
+                error = f"HTTP {status}"
+            with lock:
+                samples.append(
+                    {
+                        "callback": name,
+                        "ms": ms,
+                        "status": status,
+                        "bytes": size,
+                        "error": error,
+                    }
+                )
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, selections))
+    return {"wall_s": time.perf_counter() - start, "samples": samples}
+
+
+def report(result: dict[str, Any], concurrency: int) -> dict[str, Any]:
+    samples = result["samples"]
+    wall = result["wall_s"]
+
+    def stats(rows):
+        ms = [r["ms"] for r in rows]
+        return {
+            "requests": len(rows),
+            "errors": sum(r["error"] is not None for r in rows),
+            **{f"p{p}_ms": round(percentile(ms, p), 2) for p in (50, 95, 99)},
+            "max_ms": round(max(ms), 2) if ms else 0.0,
+            "mean_bytes": round(sum(r["bytes"] for r in rows) / max(len(rows), 1)),
+        }
+
+    names = sorted({r["callback"] for r in samples})
+    summary = {
+        "concurrency": concurrency,
+        "wall_s": round(wall, 3),
+        "throughput_rps": round(len(samples) / wall, 1) if wall else 0.0,
+        "overall": stats(samples),
+        "error_types": dict(
+            Counter(r["error"] for r in samples if r["error"] is not None)
+        ),
+        "callbacks": {
+            n: stats([r for r in samples if r["callback"] == n]) for n in names
+        },
+    }
+
+    overall = summary["overall"]
+    print("\n" + "=" * 60)
+    print(f"  {overall['requests']:,} callback requests in {summary['wall_s']:.2f}s")
+    print(
+        f"  Throughput: {summary['throughput_rps']:,} req/s "
+        f"@ concurrency {concurrency}"
+    )
+    print(f"  Errors: {overall['errors']}")
+    for error, count in sorted(summary["error_types"].items(), key=lambda e: -e[1]):
+        print(f"    {error}: {count:,}")
+    print("=" * 60)
+    print(f"{'callback':<24}{'n':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  ms")
+    for name, s in [("ALL", overall), *summary["callbacks"].items()]:
+        print(
+            f"{name:<24}{s['requests']:>7}{s['p50_ms']:>9.1f}{s['p95_ms']:>9.1f}"
+            f"{s['p99_ms']:>9.1f}{s['max_ms']:>9.1f}"
+        )
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the dashboard callbacks.")
+    parser.add_argument(
+        "--requests", type=int, default=200, help="Selections to replay"
+    )
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--warmup", type=int, default=0, help="Unmeasured selections")
+    parser.add_argument("--url", help="Hit a running server instead of the test client")
+    parser.add_argument("--record", type=Path, help="Write the selection mix (JSONL)")
+    parser.add_argument("--replay", type=Path, help="Replay a recorded selection mix")
+    parser.add_argument("--json", type=Path, help="Write the summary as JSON")
+    parser.add_argument("--max-p95-ms", type=float, help="Fail if overall p95 exceeds")
+    args = parser.parse_args()
+
+    import dashboard_template
+
+    app = dashboard_template.app
+    if args.replay:
+        selections = [json.loads(line) for line in args.replay.read_text().splitlines()]
+    else:
+        selections = build_selections(
+            dashboard_template.matches_df, args.requests, args.seed
+        )
+    if args.record:
+        args.record.write_text("".join(json.dumps(s) + "\n" for s in selections))
+
+    if args.warmup:
+        run(app, selections[: args.warmup], args.concurrency, args.url)
+    summary = report(run(app, selections, args.concurrency, args.url), args.concurrency)
+
+    if args.json:
+        args.json.write_text(json.dumps(summary, indent=2))
+    failed = False
+    if summary["overall"]["errors"]:
+        print(f"\nFAIL: {summary['overall']['errors']:,} failed requests")
+        failed = True
+    if args.max_p95_ms is not None and summary["overall"]["p95_ms"] > args.max_p95_ms:
+        print(f"\nFAIL: p95 {summary['overall']['p95_ms']} ms > {args.max_p95_ms} ms")
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
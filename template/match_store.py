@@ -0,0 +1,80 @@
+"""
+Match-partitioned event store for per-match drill-down views.
+
+Events are written once sorted by ``match_id`` (then period and index) into an
+uncompressed Arrow IPC file, alongside an offset index of each match's first
+row and row count. Loading one match is then a constant-time slice of the
+memory-mapped table rather than a filter over the full events table.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import polars as pl
+import pyarrow as pa
+
+from data_store import scan_table
+
+EVENTS_FILE = "events_by_match.arrow"
+
+# Columns the drill-down views read; missing ones are skipped
+DRILLDOWN_COLUMNS = (
+    "match_id",
+    "index_num",
+    "period",
+    "minute",
+    "second",
+    "type",
+    "team",
+    "player",
+    "location_x",
+    "location_y",
+    "shot_statsbomb_xg",
+    "shot_outcome",
+    "pass_outcome",
+    "play_pattern",
+    "possession",
+)
+SORT_COLUMNS = ("match_id", "period", "index_num", "minute", "second")
+
+
+def write_match_events(path: Path) -> pl.DataFrame:
+    """Write the match-sorted event file and return its offset index."""
+    lf = scan_table("events")
+    schema = lf.collect_schema()
+    events = (
+        lf.select([c for c in DRILLDOWN_COLUMNS if c in schema])
+        .sort([c for c in SORT_COLUMNS if c in schema])
+        .collect()
+    )
+    events.write_ipc(path, compression="uncompressed")
+    return (
+        events.group_by("match_id", maintain_order=True)
+        .agg(pl.len().alias("length"))
+        .with_columns(
+            (pl.col("length").cum_sum() - pl.col("length")).alias("offset")
+        )
+    )
+
+
+class MatchStore:
+    """Memory-mapped, match-sorted events with an O(1) per-match lookup."""
+
+    def __init__(self, path: Path, offsets: pl.DataFrame) -> None:
+        with pa.memory_map(str(path), "r") as source:
+            self._table = pa.ipc.open_file(source).read_all()
+        self._offsets = {
+            match_id: (offset, length)
+            for match_id, offset, length in offsets.select(
+                "match_id", "offset", "length"
+            ).iter_rows()
+        }
+
+    def __contains__(self, match_id: int) -> bool:
+        return match_id in self._offsets
+
+    def events(self, match_id: int) -> pl.DataFrame:
+        """Return one match's events, in order, sliced from the mapped table."""
+        offset, length = self._offsets.get(match_id, (0, 0))
+        return pl.from_arrow(self._table.slice(offset, length), rechunk=False)
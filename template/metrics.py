@@ -0,0 +1,149 @@
+"""
+Per-callback latency and payload instrumentation for the dashboard.
+
+Each instrumented callback invocation records the wall time of its phases
+(filter, aggregate, to_pandas, figure, serialize, ...), its total time and the
+size of the JSON response sent to the browser. Rolling p50/p95/p99 per
+callback and phase are served at ``/metrics``; set ``DASHBOARD_METRICS_LOG``
+to also append one JSON line per invocation.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import math
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from collections.abc import Callable
+from contextlib import contextmanager
+from typing import Any
+
+WINDOW = 1000  # invocations kept per callback for the rolling percentiles
+PERCENTILES = (50, 95, 99)
+LOG_ENV = "DASHBOARD_METRICS_LOG"
+
+_local = threading.local()
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an unsorted list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(values: list[float]) -> dict[str, float]:
+    summary = {f"p{p}": round(percentile(values, p), 3) for p in PERCENTILES}
+    summary["mean"] = round(sum(values) / len(values), 3) if values else 0.0
+    return summary
+
+
+class CallbackMetrics:
+    """Rolling per-callback, per-phase timings and response sizes."""
+
+    def __init__(self, window: int = WINDOW, log_path: str | None = None) -> None:
+        self.window = window
+        self.log_path = log_path
+        self._lock = threading.Lock()
+        self._timings: dict[str, dict[str, deque]] = defaultdict(
+            lambda: defaultdict(lambda: deque(maxlen=window))
+        )
+        self._bytes: dict[str, deque] = defaultdict(lambda: deque(maxlen=window))
+        self._counts: dict[str, int] = defaultdict(int)
+
+    def record(self, invocation: dict[str, Any]) -> None:
+        name = invocation["callback"]
+        with self._lock:
+            self._counts[name] += 1
+            timings = self._timings[name]
+            timings["total"].append(invocation["total_ms"])
+            for phase_name, ms in invocation["phases"].items():
+                timings[phase_name].append(ms)
+            if invocation.get("bytes") is not None:
+                self._bytes[name].append(invocation["bytes"])
+        if self.log_path:
+            with open(self.log_path, "a") as f:
+                f.write(json.dumps(invocation) + "\n")
+
+    def snapshot(self) -> dict[str, Any]:
+        """Current rolling statistics, as served by the metrics endpoint."""
+        with self._lock:
+            report = {}
+            for name, timings in self._timings.items():
+                sizes = list(self._bytes[name])
+                report[name] = {
+                    "count": self._counts[name],
+                    "ms": {phase: summarize(list(v)) for phase, v in timings.items()},
+                    "bytes": {**summarize(sizes), "total": sum(sizes)},
+                }
+        return {"pid": os.getpid(), "window": self.window, "callbacks": report}
+
+
+metrics = CallbackMetrics(log_path=os.environ.get(LOG_ENV))
+
+
+@contextmanager
+def phase(name: str):
+    """Time a phase of the current callback invocation (no-op outside one)."""
+    invocation = getattr(_local, "invocation", None)
+    if invocation is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = (time.perf_counter() - start) * 1000
+        phases = invocation["phases"]
+        phases[name] = round(phases.get(name, 0.0) + elapsed, 3)
+
+
+def instrument(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Record phase and total timings for every call of a Dash callback.
+
+    The response size is attached afterwards by :func:`register`'s
+    ``after_request`` hook, which runs on the same request thread.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args):
+        invocation = {
+            "callback": func.__name__,
+            "args": list(args),
+            "ts": time.time(),
+            "phases": {},
+            "bytes": None,
+        }
+        _local.invocation = invocation
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            invocation["total_ms"] = round((time.perf_counter() - start) * 1000, 3)
+            _local.invocation = None
+            _local.pending = invocation
+
+    return wrapper
+
+
+def register(server, route: str = "/metrics") -> None:
+    """Attach the response-size hook and the JSON metrics endpoint to Flask."""
+    from flask import jsonify
+
+    @server.after_request
+    def _record_payload(response):
+        invocation = getattr(_local, "pending", None)
+        if invocation is not None:
+            _local.pending = None
+            invocation["bytes"] = response.calculate_content_length()
+            metrics.record(invocation)
+        return response
+
+    @server.route(route)
+    def _metrics_endpoint():
+        return jsonify(metrics.snapshot())
@@ -0,0 +1,78 @@
+"""
+Production serving mode for the dashboard.
+
+Builds (or reuses, if still fresh) the versioned Arrow IPC snapshot of the
+prepared frames and launches N gunicorn WSGI workers that all map the same
+files, so adding workers scales across cores without multiplying resident
+memory.
+
+Usage:
+    python template/serve.py --workers 4
+    python template/serve.py --workers 8 --port 8050 --rebuild
+
+Requires gunicorn (POSIX only): ``pip install gunicorn``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+from pathlib import Path
+
+from snapshot import SNAPSHOT_DIR, current_build, is_stale, write_snapshot
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Serve the dashboard with N workers.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8050)
+    parser.add_argument("--threads", type=int, default=1, help="Threads per worker")
+    parser.add_argument("--snapshot-dir", type=Path, default=SNAPSHOT_DIR)
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Rebuild the snapshot even if the source fingerprint is unchanged",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        raise SystemExit(
+            "serve.py requires gunicorn: pip install gunicorn "
+            "(or run dashboard_template.py for the single-process dev server)"
+        )
+
+    if args.rebuild or is_stale(args.snapshot_dir):
+        print(f"Writing dashboard snapshot to {args.snapshot_dir}...")
+        write_snapshot(args.snapshot_dir, force=args.rebuild)
+    print(f"Serving snapshot {current_build(args.snapshot_dir)}")
+
+    # Workers import the dashboard after fork and memory-map the snapshot
+    os.environ["DASHBOARD_SNAPSHOT"] = str(args.snapshot_dir)
+
+    class DashboardApplication(BaseApplication):
+        def load_config(self):
+            self.cfg.set("bind", f"{args.host}:{args.port}")
+            self.cfg.set("workers", args.workers)
+            self.cfg.set("threads", args.threads)
+
+        def load(self):
+            from dashboard_template import server
+
+            return server
+
+    print("\n" + "=" * 60)
+    print("  Soccer Analytics Dashboard (production)")
+    print(f"  {args.workers} workers at http://{args.host}:{args.port}")
+    print("=" * 60 + "\n")
+    DashboardApplication().run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Versioned Arrow IPC snapshot of the prepared dashboard frames.
+
+A build step writes every frame from ``prepare_frames()`` as an uncompressed
+IPC file into its own build directory, together with a ``manifest.json``
+recording the snapshot format version and the fingerprint of the source
+parquet files. At startup the dashboard memory-maps the current build and
+only recomputes when the sources (or the format version) have changed.
+
+Layout::
+
+    data/derived/dashboard_snapshot/
+    ├── CURRENT              # name of the active build directory
+    └── <build_id>/
+        ├── manifest.json
+        ├── <frame>.arrow
+        └── events_by_match.arrow   # match-sorted events (see match_store.py)
+
+Frames are memory-mapped, so several dashboard workers share one copy of the
+pages through the OS page cache.
+
+Usage:
+    python template/snapshot.py            # build if stale
+    python template/snapshot.py --force    # always rebuild
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import polars as pl
+import pyarrow as pa
+
+from data_store import DERIVED_DIR, prepare_frames, table_path
+from figure_cache import fingerprint
+from match_store import EVENTS_FILE, MatchStore, write_match_events
+
+SNAPSHOT_DIR = DERIVED_DIR / "dashboard_snapshot"
+# Bump whenever prepare_frames() changes what it produces
+SNAPSHOT_VERSION = 3
+SOURCE_TABLES = ("matches", "events", "lineups")
+KEEP_BUILDS = 2
+
+
+def source_paths() -> list[Path]:
+    return [table_path(name) for name in SOURCE_TABLES]
+
+
+def source_fingerprint() -> list[list[Any]]:
+    """JSON-friendly (name, size, mtime_ns) fingerprint of the source files."""
+    return [list(entry) for entry in fingerprint(source_paths())]
+
+
+def build_id(sources: list[list[Any]], unique: bool = False) -> str:
+    """Build directory name for a format version + fingerprint.
+
+    Deterministic by default, so workers that rebuild the same inputs at once
+    publish the same build; ``unique`` adds a timestamp and pid for forced
+    rebuilds that must not reuse an existing build.
+    """
+    payload = json.dumps([SNAPSHOT_VERSION, sources]).encode()
+    name = f"v{SNAPSHOT_VERSION}-{hashlib.sha256(payload).hexdigest()[:12]}"
+    if unique:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        name = f"{name}-{stamp}-{os.getpid()}"
+    return name
+
+
+def current_build(snapshot_dir: Path = SNAPSHOT_DIR) -> Path | None:
+    """Return the active build directory, or None if no snapshot exists."""
+    pointer = snapshot_dir / "CURRENT"
+    if not pointer.exists():
+        return None
+    build_dir = snapshot_dir / pointer.read_text().strip()
+    return build_dir if (build_dir / "manifest.json").exists() else None
+
+
+def read_manifest(build_dir: Path) -> dict[str, Any]:
+    return json.loads((build_dir / "manifest.json").read_text())
+
+
+def is_stale(snapshot_dir: Path = SNAPSHOT_DIR) -> bool:
+    """True if there is no snapshot or it was built from different inputs."""
+    build_dir = current_build(snapshot_dir)
+    if build_dir is None:
+        return True
+    manifest = read_manifest(build_dir)
+    return (
+        manifest.get("version") != SNAPSHOT_VERSION
+        or manifest.get("sources") != source_fingerprint()
+    )
+
+
+def write_snapshot(
+    snapshot_dir: Path = SNAPSHOT_DIR, force: bool = False
+) -> dict[str, pl.DataFrame]:
+    """Prepare the dashboard frames and publish them as a new build.
+
+    The build is written to a temporary directory, renamed into place and
+    only then made current, so readers never map a half-written snapshot.
+    If another process has already published a build of the same inputs it
+    is reused; ``force`` always builds afresh under a unique build id.
+    """
+    sources = source_fingerprint()
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+    name = build_id(sources, unique=force)
+    build_dir = snapshot_dir / name
+    if (build_dir / "manifest.json").exists():
+        _publish(snapshot_dir, name)
+        return read_snapshot(snapshot_dir)
+
+    frames = prepare_frames()
+    tmp_dir = Path(tempfile.mkdtemp(prefix=".build-", dir=snapshot_dir))
+    frames["match_offsets"] = write_match_events(tmp_dir / EVENTS_FILE)
+    manifest = {
+        "version": SNAPSHOT_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "sources": sources,
+        "match_store": EVENTS_FILE,
+        "frames": {},
+    }
+    for frame_name, df in frames.items():
+        file_name = f"{frame_name}.arrow"
+        df.write_ipc(tmp_dir / file_name, compression="uncompressed")
+        manifest["frames"][frame_name] = {"file": file_name, "rows": len(df)}
+    (tmp_dir / "manifest.json").write_text(json.dumps(manifest, indent=2))
+
+    try:
+        os.replace(tmp_dir, build_dir)
+    except OSError:
+        # Lost the race to another worker publishing the same inputs
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        if not (build_dir / "manifest.json").exists():
+            raise
+    _publish(snapshot_dir, name)
+    return frames
+
+
+def _publish(snapshot_dir: Path, name: str) -> None:
+    """Atomically point CURRENT at build ``name`` and prune old builds."""
+    pointer_tmp = snapshot_dir / f".CURRENT-{os.getpid()}"
+    pointer_tmp.write_text(name)
+    os.replace(pointer_tmp, snapshot_dir / "CURRENT")
+    _prune_builds(snapshot_dir, keep=name)
+
+
+def _prune_builds(snapshot_dir: Path, keep: str) -> None:
+    builds = sorted(
+        (p for p in snapshot_dir.iterdir() if p.is_dir() and p.name.startswith("v")),
+        key=lambda p: p.stat().st_mtime,
+        reverse=True,
+    )
+    old = [p for p in builds if p.name != keep][KEEP_BUILDS - 1 :]
+    for path in old:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def map_frame(path: Path) -> pl.DataFrame:
+    """Memory-map one IPC file; fixed-width columns stay zero-copy views."""
+    with pa.memory_map(str(path), "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+    return pl.from_arrow(table, rechunk=False)
+
+
+def read_snapshot(snapshot_dir: Path = SNAPSHOT_DIR) -> dict[str, pl.DataFrame]:
+    """Memory-map every frame of the current build."""
+    build_dir = current_build(snapshot_dir)
+    if build_dir is None:
+        raise FileNotFoundError(f"No dashboard snapshot found in {snapshot_dir}")
+    manifest = read_manifest(build_dir)
+    return {
+        name: map_frame(build_dir / entry["file"])
+        for name, entry in manifest["frames"].items()
+    }
+
+
+def open_match_store(
+    snapshot_dir: Path = SNAPSHOT_DIR, offsets: pl.DataFrame | None = None
+) -> MatchStore:
+    """Open the match-partitioned event store of the current build."""
+    build_dir = current_build(snapshot_dir)
+    if build_dir is None:
+        raise FileNotFoundError(f"No dashboard snapshot found in {snapshot_dir}")
+    if offsets is None:
+        offsets = map_frame(build_dir / "match_offsets.arrow")
+    return MatchStore(build_dir / read_manifest(build_dir)["match_store"], offsets)
+
+
+def load_snapshot(snapshot_dir: Path = SNAPSHOT_DIR) -> dict[str, pl.DataFrame]:
+    """Map the current snapshot, rebuilding it first if the sources changed."""
+    if is_stale(snapshot_dir):
+        print("Building dashboard snapshot...")
+        write_snapshot(snapshot_dir)
+    return read_snapshot(snapshot_dir)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the dashboard snapshot.")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if fresh")
+    parser.add_argument("--snapshot-dir", type=Path, default=SNAPSHOT_DIR)
+    args = parser.parse_args()
+
+    if args.force or is_stale(args.snapshot_dir):
+        frames = write_snapshot(args.snapshot_dir, force=args.force)
+        print(f"Wrote {len(frames)} frames to {current_build(args.snapshot_dir)}")
+    else:
+        print(f"Snapshot is up to date: {current_build(args.snapshot_dir)}")